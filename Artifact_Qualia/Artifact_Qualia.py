@@ -14,7 +14,7 @@
 # =============================================================================
 
 from dataclasses import dataclass
-from typing import Dict, List, Any
+from typing import Dict, Tuple, Any
 import math
 
 
@@ -30,18 +30,41 @@ def smooth(prev: float, now: float, alpha: float = 0.7) -> float:
     return alpha * prev + (1 - alpha) * now
 
 
+# =============================================================================
+# Semantic Lookup Tables (built once, not per integrate call)
+# =============================================================================
+
+IMPACT_BOOST: Dict[str, float] = {
+    "low": 0.0,
+    "medium": 0.1,
+    "high": 0.25,
+}
+
+TREND_MOD: Dict[str, float] = {
+    "rising": 1.1,
+    "stable": 1.0,
+    "fading": 0.85,
+}
+
+IMPACT_DISRUPTION: Dict[str, float] = {
+    "low": 0.05,
+    "medium": 0.15,
+    "high": 0.30,
+}
+
+
 # =============================================================================
 # Data Contracts
 # =============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RIMSemantic:
     impact_level: str              # low | medium | high
     impact_trend: str              # rising | stable | fading
-    affected_domains: List[str]
+    affected_domains: Tuple[str, ...]
 
 
-@dataclass
+@dataclass(slots=True)
 class QualiaSnapshot:
     """
     Lived phenomenological snapshot.
@@ -63,6 +86,8 @@ class ArtifactQualiaCore:
     Artifact Qualia Core v1
     """
 
+    __slots__ = ("_last_intensity", "_last_coherence")
+
     def __init__(self):
         self._last_intensity: float = 0.3
         self._last_coherence: float = 0.6
@@ -118,17 +143,8 @@ class ArtifactQualiaCore:
             eva.get("emotional_tension", 0.0)
         )
 
-        impact_boost = {
-            "low": 0.0,
-            "medium": 0.1,
-            "high": 0.25,
-        }.get(rim.impact_level, 0.0)
-
-        trend_mod = {
-            "rising": 1.1,
-            "stable": 1.0,
-            "fading": 0.85,
-        }.get(rim.impact_trend, 1.0)
+        impact_boost = IMPACT_BOOST.get(rim.impact_level, 0.0)
+        trend_mod = TREND_MOD.get(rim.impact_trend, 1.0)
 
         raw = clamp((base + impact_boost) * trend_mod)
 
@@ -148,11 +164,7 @@ class ArtifactQualiaCore:
         stability = eva.get("coherence", 0.5)
         momentum = eva.get("momentum", 0.5)
 
-        disruption = {
-            "low": 0.05,
-            "medium": 0.15,
-            "high": 0.30,
-        }.get(rim.impact_level, 0.1)
+        disruption = IMPACT_DISRUPTION.get(rim.impact_level, 0.1)
 
         raw = clamp(stability + momentum - disruption)
 
@@ -4,11 +4,77 @@ Phenomenological Experience Integrator with State Bus support.
 """
 
 from pathlib import Path
+import os
 import json
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+import time
+import atexit
+import logging
+import queue
+import threading
+import types
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from artifact_qualia.Artifact_Qualia import ArtifactQualiaCore, RIMSemantic, QualiaSnapshot
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Writer-thread shutdown marker
+_STOP = object()
+
+# State Bus slots
+_MATRIX_SLOT = "matrix_state"
+_QUALIA_SLOT = "qualia_state"
+
+_FLOAT_ONLY = frozenset((float,))
+
+# Shared read-only fallback for missing State Bus data (no per-call {} allocation)
+_EMPTY = types.MappingProxyType({})
+
+# Interned RIMSemantic values keyed by (level, trend, domains); seeded with
+# the common combinations, grown on demand up to a small bound
+_RIM_INTERN_MAX = 64
+_RIM_INTERN: Dict[Tuple[str, str, Tuple[str, ...]], RIMSemantic] = {
+    (level, trend, ("ambient",)): RIMSemantic(level, trend, ("ambient",))
+    for level in ("low", "medium", "high")
+    for trend in ("rising", "stable", "fading")
+}
+_DEFAULT_RIM = _RIM_INTERN[("low", "stable", ("ambient",))]
+
+_PROCESS_EXPERIENCE_DOC = """
+Integrate psyche state and semantic impact to produce qualia.
+
+Args:
+    eva_state: Optional override for psychological state (axes_9d). If None, pulled from MSP.
+    rim_semantic: Optional override for RIM semantic impact.
+
+Returns:
+    Dict representation of QualiaSnapshot.
+"""
+
+# Integration memo: inputs quantized to this many decimals, bounded LRU size
+_MEMO_DECIMALS = 3
+_MEMO_MAX_ENTRIES = 256
+
+
+def _utc_timestamp() -> str:
+    """UTC ISO-8601 timestamp in datetime.isoformat() shape, without building a datetime."""
+    t = time.time()
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(t)) + ".%06d+00:00" % int((t % 1) * 1e6)
+
 
 class ArtifactQualiaSystem:
     """
@@ -19,81 +85,231 @@ class ArtifactQualiaSystem:
     - Context-aware integration
     """
 
+    __slots__ = (
+        "base_path", "msp", "_msp_get", "_msp_set",
+        "state_file", "_state_path", "_state_fd", "_last_written",
+        "_dirty", "_last_flush", "_flush_interval",
+        "core", "last_qualia", "_memo",
+        "_write_q", "_writer",
+        # Per-instance specialized callable, see _make_process_experience
+        "process_experience",
+    )
+
     def __init__(self, base_path: Path = None, msp=None):
         self.base_path = base_path or Path(".")
         self.msp = msp
+        # Pre-bound State Bus accessors (msp never changes after construction)
+        self._msp_get = msp.get_active_state if msp else None
+        self._msp_set = msp.set_active_state if msp else None
         self.state_file = self.base_path / "consciousness/10_state/artifact_qualia_state.json"
+        # Plain str path, resolved once for the os-level calls
+        self._state_path = os.fspath(self.state_file)
+        os.makedirs(os.path.dirname(self._state_path), exist_ok=True)
+        self._state_fd: Optional[int] = None
+        self._last_written: Optional[bytes] = None
+
+        # Write coalescing: persist at most once per flush interval
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._flush_interval = 0.25
         
         # Instance of pure logic
         self.core = ArtifactQualiaCore()
         self.last_qualia: Optional[QualiaSnapshot] = None
+        # key -> (snapshot, State Bus payload template without timestamp)
+        self._memo: "OrderedDict[Tuple, Tuple[QualiaSnapshot, Dict[str, Any]]]" = OrderedDict()
 
         self._load_state()
-        print(f"[Artifact Qualia System] Initialized (Phenomenology Core)")
 
-    def process_experience(
-        self, 
-        eva_state: Dict[str, float] = None, 
-        rim_semantic: Dict[str, Any] = None
-    ) -> Dict[str, Any]:
+        # Disk I/O runs on a single writer thread fed with state snapshots
+        self._write_q: queue.Queue = queue.Queue(maxsize=4)
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="artifact-qualia-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.close)
+
+        self.process_experience = self._make_process_experience()
+        logger.info("[Artifact Qualia System] Initialized (Phenomenology Core)")
+
+    def _make_process_experience(self):
+        """
+        Build process_experience specialized for this instance.
+
+        msp never changes after construction, so the State Bus pull/push
+        branch is decided once here and the hot-path collaborators are
+        bound as closure locals.
+        """
+        integrate = self._integrate_memo
+        to_rim = self._to_rim_semantic
+        monotonic = time.monotonic
+        interval = self._flush_interval
+
+        if self._msp_get is None:
+            def process_experience(
+                eva_state: Dict[str, float] = None,
+                rim_semantic: Dict[str, Any] = None
+            ) -> Dict[str, Any]:
+                result_dict = integrate(eva_state, to_rim(rim_semantic))
+                self._dirty = True
+                if monotonic() - self._last_flush > interval:
+                    self.flush()
+                return result_dict
+        else:
+            pull = self._pull_eva_state
+            push = self._msp_set
+
+            def process_experience(
+                eva_state: Dict[str, float] = None,
+                rim_semantic: Dict[str, Any] = None
+            ) -> Dict[str, Any]:
+                # 1. PULL from State Bus if eva_state not provided
+                if eva_state is None:
+                    eva_state = pull()
+                # 2-3. Resolve RIM semantic and process via Core
+                # (memoized on quantized inputs + smoothing state)
+                result_dict = integrate(eva_state, to_rim(rim_semantic))
+                # 4. PUSH to State Bus
+                push(_QUALIA_SLOT, result_dict)
+                self._dirty = True
+                if monotonic() - self._last_flush > interval:
+                    self.flush()
+                return result_dict
+
+        process_experience.__doc__ = _PROCESS_EXPERIENCE_DOC
+        return process_experience
+
+    def process_experiences(self, experiences: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Integrate psyche state and semantic impact to produce qualia.
+        Integrate a batch of experiences in order (replay / warm-up).
 
-        Args:
-            eva_state: Optional override for psychological state (axes_9d). If None, pulled from MSP.
-            rim_semantic: Optional override for RIM semantic impact.
+        Each item may carry "eva_state" and "rim_semantic" overrides with the
+        same meaning as in process_experience. The State Bus is read at most
+        once and written once with the last snapshot, and persistence is
+        flushed once for the whole batch.
 
         Returns:
-            Dict representation of QualiaSnapshot.
+            List of QualiaSnapshot dicts, one per input.
         """
-        # 1. PULL from State Bus if eva_state not provided
-        if eva_state is None and self.msp:
-            matrix_data = self.msp.get_active_state("matrix_state") or {}
-            # Map axes_9d to expected flat dict for ArtifactQualiaCore
-            axes = matrix_data.get("axes_9d", {})
-            # ArtifactQualiaCore expects specific keys, let's provide mapping or defaults
-            eva_state = {
-                "baseline_arousal": axes.get("Alertness", 0.5),
-                "emotional_tension": axes.get("Stress", 0.3),
-                "coherence": axes.get("Groundedness", 0.6),
-                "momentum": matrix_data.get("momentum", {}).get("total", 0.5),
-                "calm_depth": axes.get("Openness", 0.4)
-            }
+        results: List[Dict[str, Any]] = []
+        if not experiences:
+            return results
+
+        bus_state = None
+        for item in experiences:
+            eva_state = item.get("eva_state")
+            if eva_state is None and self._msp_get:
+                if bus_state is None:
+                    bus_state = self._pull_eva_state()
+                eva_state = bus_state
+            results.append(self._integrate_memo(
+                eva_state, self._to_rim_semantic(item.get("rim_semantic"))
+            ))
+
+        if self._msp_set:
+            self._msp_set(_QUALIA_SLOT, results[-1])
+
+        self._dirty = True
+        self.flush()
+        return results
 
-        # 2. Default RIM Semantic if not provided
+    def _pull_eva_state(self) -> Dict[str, float]:
+        """Read matrix_state from the State Bus as the flat dict ArtifactQualiaCore expects."""
+        matrix_data = self._msp_get(_MATRIX_SLOT) or _EMPTY
+        axis = (matrix_data.get("axes_9d") or _EMPTY).get
+        return {
+            "baseline_arousal": axis("Alertness", 0.5),
+            "emotional_tension": axis("Stress", 0.3),
+            "coherence": axis("Groundedness", 0.6),
+            "momentum": (matrix_data.get("momentum") or _EMPTY).get("total", 0.5),
+            "calm_depth": axis("Openness", 0.4)
+        }
+
+    @staticmethod
+    def _to_rim_semantic(rim_semantic: Optional[Dict[str, Any]]) -> RIMSemantic:
+        """Convert a RIM semantic dict to an interned RIMSemantic (default when not provided)."""
         if rim_semantic is None:
             # Placeholder/Simple heuristic for now
-            rim_semantic = RIMSemantic(
-                impact_level="low",
-                impact_trend="stable",
-                affected_domains=["ambient"]
-            )
+            return _DEFAULT_RIM
+
+        key = (
+            rim_semantic.get("impact_level", "low"),
+            rim_semantic.get("impact_trend", "stable"),
+            tuple(rim_semantic.get("affected_domains", ("ambient",)))
+        )
+        rim = _RIM_INTERN.get(key)
+        if rim is None:
+            rim = RIMSemantic(*key)
+            if len(_RIM_INTERN) < _RIM_INTERN_MAX:
+                _RIM_INTERN[key] = rim
+        return rim
+
+    @staticmethod
+    def _snapshot_to_dict(snapshot: QualiaSnapshot) -> Dict[str, Any]:
+        """Serialize a QualiaSnapshot into a State Bus payload template (no timestamp)."""
+        # Core texture is normally all floats already: a C-level dict() copy
+        # keeps the snapshot private without a per-key float() rebuild
+        texture = snapshot.texture
+        if set(map(type, texture.values())) <= _FLOAT_ONLY:
+            texture = dict(texture)
         else:
-            # Convert dict to RIMSemantic object
-            rim_semantic = RIMSemantic(
-                impact_level=rim_semantic.get("impact_level", "low"),
-                impact_trend=rim_semantic.get("impact_trend", "stable"),
-                affected_domains=rim_semantic.get("affected_domains", ["ambient"])
-            )
-
-        # 3. Process via Core
-        self.last_qualia = self.core.integrate(eva_state, rim_semantic)
-
-        # 4. PUSH to State Bus
-        result_dict = {
-            "intensity": float(self.last_qualia.intensity),
-            "tone": str(self.last_qualia.tone),
-            "coherence": float(self.last_qualia.coherence),
-            "depth": float(self.last_qualia.depth),
-            "texture": {k: float(v) for k, v in self.last_qualia.texture.items()},
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            texture = {k: float(v) for k, v in texture.items()}
+
+        return {
+            "intensity": float(snapshot.intensity),
+            "tone": str(snapshot.tone),
+            "coherence": float(snapshot.coherence),
+            "depth": float(snapshot.depth),
+            "texture": texture
         }
 
-        if self.msp:
-            self.msp.set_active_state("qualia_state", result_dict)
+    def _integrate_memo(
+        self,
+        eva_state: Dict[str, float],
+        rim_semantic: RIMSemantic
+    ) -> Dict[str, Any]:
+        """
+        Run core.integrate and return a fresh State Bus payload, reusing the
+        snapshot and serialized payload of an earlier call whose quantized
+        inputs match. The core smooths against its previous
+        intensity/coherence, so that state is part of the key and is
+        restored from the cached snapshot on a hit.
+        """
+        core_state = self.core.get_full_state()
+        key = (
+            tuple((k, round(v, _MEMO_DECIMALS)) for k, v in eva_state.items()),
+            round(core_state["last_intensity"], _MEMO_DECIMALS),
+            round(core_state["last_coherence"], _MEMO_DECIMALS),
+            rim_semantic,
+        )
+
+        memo = self._memo
+        entry = memo.get(key)
+        if entry is not None:
+            memo.move_to_end(key)
+            snapshot, template = entry
+            self.core.load_state({
+                "last_intensity": snapshot.intensity,
+                "last_coherence": snapshot.coherence
+            })
+        else:
+            snapshot = self.core.integrate(eva_state, rim_semantic)
+            template = self._snapshot_to_dict(snapshot)
+            memo[key] = (snapshot, template)
+            if len(memo) > _MEMO_MAX_ENTRIES:
+                memo.popitem(last=False)
+
+        self.last_qualia = snapshot
+
+        # MSP keeps the payload by reference, so hand out copies of the template
+        result = template.copy()
+        result["texture"] = template["texture"].copy()
+        result["timestamp"] = _utc_timestamp()
+        return result
 
-        self._save_state()
-        return result_dict
+    def cache_clear(self):
+        """Drop all memoized integration results."""
+        self._memo.clear()
 
     def get_full_state(self) -> Dict[str, Any]:
         """Return complete system state."""
@@ -110,20 +326,82 @@ class ArtifactQualiaSystem:
 
     def _load_state(self):
         """Load internal core state from persistence."""
-        if self.state_file.exists():
+        if os.path.exists(self._state_path):
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self._state_path, 'rb') as f:
+                    data = _loads(f.read())
                     self.core.load_state(data)
-                    print(f"[Artifact Qualia] Loaded state (Intensity: {data.get('last_intensity', 'N/A')})")
+                    logger.info("[Artifact Qualia] Loaded state (Intensity: %s)", data.get('last_intensity', 'N/A'))
             except Exception as e:
-                print(f"[Artifact Qualia] Warning: Could not load state: {e}")
+                logger.warning("[Artifact Qualia] Could not load state: %s", e)
 
-    def _save_state(self):
-        """Save internal core state to persistence."""
+    def _save_state(self, state: Dict[str, Any]):
+        """
+        Save a core state snapshot to persistence (writer thread only).
+        Reuses one open descriptor (truncate + write at offset 0) instead of
+        reopening the file on every experience tick.
+        """
         try:
-            self.state_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(self.core.get_full_state(), f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"[Artifact Qualia] Warning: Could not save state: {e}")
+            buf = _dumps(state)
+            if buf == self._last_written:
+                return
+            if self._state_fd is None:
+                self._state_fd = os.open(self._state_path, os.O_WRONLY | os.O_CREAT, 0o644)
+            os.ftruncate(self._state_fd, 0)
+            if hasattr(os, "pwrite"):
+                os.pwrite(self._state_fd, buf, 0)
+            else:
+                # Windows has no pwrite
+                os.lseek(self._state_fd, 0, os.SEEK_SET)
+                os.write(self._state_fd, buf)
+            self._last_written = buf
+        except Exception:
+            logger.warning("[Artifact Qualia] Could not save state", exc_info=True)
+
+    def _writer_loop(self):
+        """Drain snapshots from the write queue until the stop marker arrives."""
+        write_q = self._write_q
+        while True:
+            state = write_q.get()
+            # Coalesce a backlog: only the newest snapshot needs to hit the disk
+            stop = state is _STOP
+            while not stop:
+                try:
+                    pending = write_q.get_nowait()
+                except queue.Empty:
+                    break
+                if pending is _STOP:
+                    stop = True
+                else:
+                    state = pending
+            if state is not _STOP:
+                self._save_state(state)
+            if stop:
+                break
+
+    def flush(self):
+        """Hand pending state to the writer thread if anything changed."""
+        if self._dirty:
+            # Snapshot on the caller side so the writer never races the core
+            state = self.core.get_full_state()
+            try:
+                self._write_q.put_nowait(state)
+            except queue.Full:
+                # Drop the oldest pending snapshot; only the latest matters
+                try:
+                    self._write_q.get_nowait()
+                except queue.Empty:
+                    pass
+                self._write_q.put_nowait(state)
+            self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush pending state, stop the writer and release the file descriptor."""
+        self.flush()
+        if self._writer.is_alive():
+            self._write_q.put(_STOP)
+            self._writer.join()
+        if self._state_fd is not None:
+            os.close(self._state_fd)
+            self._state_fd = None
@@ -4,11 +4,28 @@ Memory encoding with State Bus support.
 """
 
 from pathlib import Path
+import os
 import json
+import logging
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from resonance_memory_system.rms_v6 import RMSEngineV6
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps_state(data: Dict[str, Any]) -> bytes:
+    """Serialize the persisted state as indented UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
 
 class RMSSystem:
     """
@@ -18,18 +35,21 @@ class RMSSystem:
     - Persistence to 10_state
     - Context-aware processing for Episodic Memory
     """
+    __slots__ = ("base_path", "msp", "state_file", "_last_saved", "engine", "last_encoding")
 
     def __init__(self, base_path: Path = None, msp=None):
         self.base_path = base_path or Path(".")
         self.msp = msp
         self.state_file = self.base_path / "consciousness/10_state/rms_state.json"
+        # Bytes of the last successful save (identical states are not rewritten)
+        self._last_saved: Optional[bytes] = None
         
         # Instance of pure logic
         self.engine = RMSEngineV6()
         self.last_encoding: Optional[Dict[str, Any]] = None
 
         self._load_state()
-        print(f"[RMS System] Initialized (Memory Encoding Core)")
+        logger.info("[RMS System] Initialized (Memory Encoding Core)")
 
     def process_encoding(
         self,
@@ -51,9 +71,12 @@ class RMSSystem:
             Dict representation of the encoding buffer.
         """
         # 1. PULL from State Bus if dependencies not provided
-        if self.msp:
+        if self.msp and (matrix_state is None or qualia_state is None or reflex_state is None):
+            matrix_data, qualia_data, reflex_data = self.msp.get_active_states(
+                ("matrix_state", "qualia_state", "reflex_directives")
+            )
             if matrix_state is None:
-                matrix_data = self.msp.get_active_state("matrix_state") or {}
+                matrix_data = matrix_data or {}
                 # RMS Engine expects specific keys (stress_load, social_warmth, etc.)
                 # Mapping from 9D axes for standard RMS ingestion:
                 axes = matrix_data.get("axes_9d", {})
@@ -68,10 +91,10 @@ class RMSSystem:
                 }
 
             if qualia_state is None:
-                qualia_state = self.msp.get_active_state("qualia_state") or {"intensity": 0.5}
+                qualia_state = qualia_data or {"intensity": 0.5}
 
             if reflex_state is None:
-                reflex_state = self.msp.get_active_state("reflex_directives") or {"threat_level": 0.0}
+                reflex_state = reflex_data or {"threat_level": 0.0}
 
         # 2. Process via Engine
         # RMS v6.2 Engine.process expects (eva_matrix, rim_output, reflex_state, ri_total)
@@ -90,9 +113,12 @@ class RMSSystem:
 
         # 3. PUSH to State Bus
         if self.msp:
-            self.msp.set_active_state("encoding_buffer", self.last_encoding)
-            self.msp.set_active_state("core_color", self.last_encoding.get("memory_color", "#808080"))
-            self.msp.set_active_state("resonance_textures", self.last_encoding.get("resonance_texture", {}))
+            encoding = self.last_encoding
+            self.msp.set_active_states({
+                "encoding_buffer": encoding,
+                "core_color": encoding["memory_color"],
+                "resonance_textures": encoding["resonance_texture"]
+            })
 
         self._save_state()
         return self.last_encoding
@@ -105,18 +131,34 @@ class RMSSystem:
         """Load internal core state from persistence."""
         if self.state_file.exists():
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.state_file, 'rb') as f:
+                    raw = f.read()
+                    data = json.loads(raw)
                     self.engine.load_state(data)
-                    print(f"[RMS System] Loaded state (Intensity: {data.get('last_intensity', 'N/A')})")
+                    self._last_saved = raw
+                    logger.info("[RMS System] Loaded state (Intensity: %s)", data.get('last_intensity', 'N/A'))
             except Exception as e:
-                print(f"[RMS System] Warning: Could not load state: {e}")
+                logger.warning("[RMS System] Could not load state: %s", e)
 
-    def _save_state(self):
-        """Save internal core state to persistence."""
+    def _save_state(self, force: bool = False):
+        """
+        Save internal core state to persistence.
+        Skipped when the engine state moved less than its dirty tolerance
+        since the last save, unless force=True.
+        """
+        if not force and not self.engine.dirty:
+            return
         try:
+            data = _dumps_state(self.engine.get_full_state())
+            if data == self._last_saved:
+                self.engine.mark_saved()
+                return
             self.state_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(self.engine.get_full_state(), f, indent=2, ensure_ascii=False)
+            tmp_path = str(self.state_file) + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.state_file)
+            self._last_saved = data
+            self.engine.mark_saved()
         except Exception as e:
-            print(f"[RMS System] Warning: Could not save state: {e}")
+            logger.warning("[RMS System] Could not save state: %s", e)
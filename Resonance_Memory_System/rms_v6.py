@@ -3,7 +3,7 @@
 # Resonance Memory System (EVA_Matrix–based)
 # =============================================================================
 
-import math
+from bisect import bisect_right
 from typing import Dict, Any, List
 
 # -----------------------------------------------------------------------------
@@ -16,6 +16,29 @@ def clamp(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
 def smooth(prev: float, now: float, alpha: float = 0.7) -> float:
     return (alpha * prev) + ((1.0 - alpha) * now)
 
+# RMS color axes in fixed order, with the EVA matrix key (and default) each one reads
+_COLOR_AXES = ("stress", "warmth", "clarity", "drive", "calm")
+_COLOR_SOURCES = (
+    ("stress_load", 0.0),
+    ("social_warmth", 0.5),
+    ("cognitive_clarity", 0.5),
+    ("drive_level", 0.3),
+    ("affective_stability", 0.5),
+)
+# smooth(prev, now, alpha=0.65) weights for the color axes
+_COLOR_ALPHA = 0.65
+_COLOR_BETA = 1.0 - _COLOR_ALPHA
+
+# Smallest change in intensity / any color axis that makes the state worth persisting
+_DIRTY_TOLERANCE = 1e-4
+
+# memory_encoding_level by intensity: < 0.2, < 0.4, < 0.7, rest
+_LEVEL_THRESHOLDS = (0.2, 0.4, 0.7)
+_LEVEL_NAMES = ("L0_trace", "L1_light", "L2_standard", "L3_deep")
+
+# Two-digit hex for every channel value (memory_color packing)
+HEX = tuple(f"{i:02x}" for i in range(256))
+
 # -----------------------------------------------------------------------------
 # RMS Engine
 # -----------------------------------------------------------------------------
@@ -27,17 +50,23 @@ class RMSEngineV6:
     - Output aligned with Episodic Memory Schema
     """
 
+    __slots__ = ("_last_color", "_last_intensity", "_saved_color", "_saved_intensity",
+                 "dirty")
+
+    # RIM impact -> intensity modifiers
+    _IMPACT_BOOST = {"low": 0.0, "medium": 0.1, "high": 0.25}
+    _TREND_MOD = {"rising": 1.1, "stable": 1.0, "fading": 0.85}
+
     def __init__(self):
-        # Internal smoothing memory
-        self._last_color_axes = {
-            "stress": 0.2,
-            "warmth": 0.5,
-            "clarity": 0.5,
-            "drive": 0.3,
-            "calm": 0.4,
-        }
+        # Internal smoothing memory (color axes in _COLOR_AXES order)
+        self._last_color: List[float] = [0.2, 0.5, 0.5, 0.3, 0.4]
         self._last_intensity = 0.3
 
+        # State as of the last mark_saved(); None = never persisted
+        self._saved_color: List[float] = None
+        self._saved_intensity: float = None
+        self.dirty = True
+
     def process(
         self,
         eva_matrix: Dict[str, Any],
@@ -58,28 +87,27 @@ class RMSEngineV6:
         threat = reflex_state.get("threat_level", 0.0)
         trauma_flag = threat > 0.85
 
-        # 2. Color Generation (from logicupdate.py mapping)
-        raw_color_axes = self._generate_color_axes(eva_matrix)
-        
-        # 3. Intensity Calculation (from logicupdate.py mapping)
-        raw_intensity = self._compute_intensity(eva_matrix, rim_output)
+        # 2-3. Color axes + intensity base, one read of the EVA matrix (logicupdate.py mapping)
+        raw_color_axes, base = self._read_eva_axes(eva_matrix)
+        raw_intensity = self._compute_intensity(base, rim_output)
 
         # 4. Trauma Protection
+        # Dims color by 45% and intensity by 50% as per interface contract
+        dim = 0.55 if trauma_flag else 1.0
         if trauma_flag:
-            # Dims color by 45% and intensity by 50% as per interface contract
-            raw_color_axes = {k: v * 0.55 for k, v in raw_color_axes.items()}
             raw_intensity *= 0.5
 
-        # 5. Smoothing (Temporal Continuity)
-        color_axes = {
-            k: smooth(self._last_color_axes[k], v, alpha=0.65)
-            for k, v in raw_color_axes.items()
-        }
+        # 5. Smoothing (Temporal Continuity), one pass over the 5 axes with the dim applied
+        color_axes = [
+            (_COLOR_ALPHA * prev) + (_COLOR_BETA * (v * dim))
+            for prev, v in zip(self._last_color, raw_color_axes)
+        ]
         intensity = smooth(self._last_intensity, raw_intensity, alpha=0.7)
 
         # Update last state
-        self._last_color_axes = color_axes
+        self._last_color = color_axes
         self._last_intensity = intensity
+        self.dirty = self._changed_since_save()
 
         # 6. Formatting for Episodic Memory Snapshot
         return self._package_output(eva_matrix, ri_total, intensity, color_axes, threat, trauma_flag)
@@ -88,22 +116,20 @@ class RMSEngineV6:
     # Internal Logic
     # -------------------------------------------------------------------------
 
-    def _generate_color_axes(self, eva: Dict[str, Any]) -> Dict[str, float]:
-        """Mapping 9D Axes -> 5 RMS Color Axes"""
-        return {
-            "stress": clamp(eva.get("stress_load", 0.0)),
-            "warmth": clamp(eva.get("social_warmth", 0.5)),
-            "clarity": clamp(eva.get("cognitive_clarity", 0.5)),
-            "drive": clamp(eva.get("drive_level", 0.3)),
-            "calm": clamp(eva.get("affective_stability", 0.5))
-        }
+    def _read_eva_axes(self, eva: Dict[str, Any]):
+        """
+        Mapping 9D Axes -> 5 RMS Color Axes (in _COLOR_AXES order), plus the
+        load base for intensity (stress + drive, unclamped inputs) from the same read.
+        """
+        raw = [eva.get(key, default) for key, default in _COLOR_SOURCES]
+        # Intensity counts a missing drive_level as 0.0, not the 0.3 color default
+        drive = raw[3] if "drive_level" in eva else 0.0
+        return [clamp(v) for v in raw], clamp(raw[0] + drive)
 
-    def _compute_intensity(self, eva: Dict[str, Any], rim: Dict[str, Any]) -> float:
+    def _compute_intensity(self, base: float, rim: Dict[str, Any]) -> float:
         """Overall affective intensity based on load and resonance impact"""
-        base = clamp(eva.get("stress_load", 0.0) + eva.get("drive_level", 0.0))
-        
-        impact_boost = {"low": 0.0, "medium": 0.1, "high": 0.25}.get(rim.get("impact_level"), 0.1)
-        trend_mod = {"rising": 1.1, "stable": 1.0, "fading": 0.85}.get(rim.get("impact_trend"), 1.0)
+        impact_boost = self._IMPACT_BOOST.get(rim.get("impact_level"), 0.1)
+        trend_mod = self._TREND_MOD.get(rim.get("impact_trend"), 1.0)
 
         return clamp((base + impact_boost) * trend_mod)
 
@@ -111,36 +137,28 @@ class RMSEngineV6:
                        eva: Dict[str, Any], 
                        ri: float, 
                        intensity: float, 
-                       color_axes: Dict[str, float], 
+                       color_axes: List[float], 
                        threat: float,
                        trauma: bool) -> Dict[str, Any]:
         """Aligns output with episodic_memory_spec.yaml state_snapshot structure"""
         
         # Determine memory_encoding_level (L0-L4)
-        if trauma:
-            level = "L4_trauma"
-        elif intensity < 0.2:
-            level = "L0_trace"
-        elif intensity < 0.4:
-            level = "L1_light"
-        elif intensity < 0.7:
-            level = "L2_standard"
-        else:
-            level = "L3_deep"
+        level = "L4_trauma" if trauma else _LEVEL_NAMES[bisect_right(_LEVEL_THRESHOLDS, intensity)]
 
         # 7. Convert 5D Texture axes to Hex Color (The "Passport" Visual)
-        r_val = color_axes.get("stress", 0.0) * 255
-        g_val = color_axes.get("calm", 0.0) * 200 + color_axes.get("clarity", 0.0) * 55
-        b_val = color_axes.get("warmth", 0.0) * 150 + color_axes.get("calm", 0.0) * 100
-        r_val += color_axes.get("warmth", 0.0) * 50
+        stress, warmth, clarity, _, calm = color_axes
         
-        multiplier = (intensity * 0.5) + (color_axes.get("clarity", 0.5) * 0.5)
+        multiplier = (intensity * 0.5) + (clarity * 0.5)
         
-        final_r = int(max(0, min(255, r_val * multiplier)))
-        final_g = int(max(0, min(255, g_val * multiplier)))
-        final_b = int(max(0, min(255, b_val * multiplier)))
-        hex_color = f"#{final_r:02x}{final_g:02x}{final_b:02x}"
-
+        r_val = (stress * 255 + warmth * 50) * multiplier
+        g_val = (calm * 200 + clarity * 55) * multiplier
+        b_val = (warmth * 150 + calm * 100) * multiplier
+        hex_color = ("#" + HEX[int(max(0, min(255, r_val)))]
+                     + HEX[int(max(0, min(255, g_val)))]
+                     + HEX[int(max(0, min(255, b_val)))])
+
+        # One literal per call: every caller keeps the snapshot (State Bus, episodes),
+        # so a reused template would need a full copy anyway
         return {
             "EVA_matrix": {
                 "stress_load": float(eva.get("stress_load", 0.0)),
@@ -153,26 +171,39 @@ class RMSEngineV6:
             "Resonance_index": float(ri),
             "memory_encoding_level": level,
             "memory_color": hex_color,
-            "resonance_texture": {k: float(v) for k, v in color_axes.items()},
-            "qualia": {
-                "intensity": float(intensity)
-            },
-            "reflex": {
-                "threat_level": float(threat)
-            },
+            # Smoothed axes are already floats
+            "resonance_texture": dict(zip(_COLOR_AXES, color_axes)),
+            "qualia": {"intensity": float(intensity)},
+            "reflex": {"threat_level": float(threat)},
             "trauma_flag": trauma
         }
 
+    def _changed_since_save(self) -> bool:
+        if self._saved_color is None:
+            return True
+        if abs(self._last_intensity - self._saved_intensity) > _DIRTY_TOLERANCE:
+            return True
+        return any(abs(now - saved) > _DIRTY_TOLERANCE
+                   for now, saved in zip(self._last_color, self._saved_color))
+
+    def mark_saved(self):
+        """Record the current smoothing state as persisted (clears `dirty`)"""
+        self._saved_color = list(self._last_color)
+        self._saved_intensity = self._last_intensity
+        self.dirty = False
+
     def get_full_state(self) -> Dict[str, Any]:
         return {
-            "last_color_axes": {k: float(v) for k, v in self._last_color_axes.items()},
+            "last_color_axes": {k: float(v) for k, v in zip(_COLOR_AXES, self._last_color)},
             "last_intensity": float(self._last_intensity)
         }
 
     def load_state(self, state_dict: Dict[str, Any]):
         if "last_color_axes" in state_dict:
-            self._last_color_axes.update(state_dict["last_color_axes"])
+            saved = state_dict["last_color_axes"]
+            self._last_color = [saved.get(k, v) for k, v in zip(_COLOR_AXES, self._last_color)]
         self._last_intensity = state_dict.get("last_intensity", 0.3)
+        self.mark_saved()
 
 # -----------------------------------------------------------------------------
 # Example Usage (Mock Only for Standalone Test)
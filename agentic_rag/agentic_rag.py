@@ -22,12 +22,57 @@ to retrieve memories that were formed in similar bodily states, enabling
 """
 
 import math
-from typing import Dict, List, Any, Optional
+import time
+import heapq
+import logging
+import threading
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Ranking key for MemoryMatch lists
+_score_getter = attrgetter("score")
+
+# Semantic retrieval cache: entries per AgenticRAG and their lifetime in seconds
+_RESULT_CACHE_SIZE = 256
+_RESULT_CACHE_TTL = 60.0
+
+# _apply_temporal_decay switches to one vectorized exp() from this many timestamped matches
+_NUMPY_DECAY_MIN = 64
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso(timestamp: str) -> datetime:
+    """datetime.fromisoformat, memoized (the same episodes come back across retrievals)"""
+    return datetime.fromisoformat(timestamp)
+
+
+@lru_cache(maxsize=4096)
+def _unit_trace(values: tuple) -> tuple:
+    """
+    L2-normalized physio trace row (None = key absent, counted as 0.0).
+    Memoized, so each stored trace is normalized once rather than on every query.
+    """
+    row = [0.0 if v is None else v for v in values]
+    norm = math.sqrt(sum(v * v for v in row))
+    if norm == 0:
+        return (0.0,) * len(row)
+    return tuple(v / norm for v in row)
+
+
+@dataclass(slots=True)
 class MemoryMatch:
     """Single memory match result"""
     episode_id: str
@@ -47,6 +92,38 @@ class AgenticRAG:
     memories based on physiological similarity rather than semantic content.
     """
 
+    # Stream names, in retrieval (and tie-break) order
+    _ALL_STREAMS: Tuple[str, ...] = (
+        "narrative",
+        "salience",
+        "sensory",
+        "intuition",
+        "emotion",
+        "temporal",
+        "reflection"
+    )
+
+    # Stream name -> MSP query method (per-stream fallback when there is no batch API)
+    _STREAM_QUERIES = {
+        "narrative": "query_narrative_chain",
+        "salience": "query_by_salience",
+        "sensory": "query_sensory_memories",
+        "intuition": "query_semantic_patterns",
+        "emotion": "query_by_physio_state",
+        "temporal": "query_recent_episodes",
+        "reflection": "query_reflections"
+    }
+
+    # Physio signature used by the Emotion Stream, in fixed vector order
+    _PHYSIO_KEYS = (
+        "ans_sympathetic",
+        "ans_parasympathetic",
+        "cortisol",
+        "adrenaline",
+        "dopamine",
+        "serotonin"
+    )
+
     def __init__(
         self,
         msp_client=None,
@@ -68,10 +145,38 @@ class AgenticRAG:
         self.decay_halflife_days = decay_halflife_days
         self.max_results_per_stream = max_results_per_stream
 
+        # Stream name -> (MSP request builder, match builder over the returned episodes)
+        self._streams = {
+            "narrative": (self._narrative_request, self._build_narrative_matches),
+            "salience": (self._salience_request, self._build_salience_matches),
+            "sensory": (self._sensory_request, self._build_sensory_matches),
+            "intuition": (self._intuition_request, self._build_intuition_matches),
+            "emotion": (self._emotion_request, self._build_emotion_matches),
+            "temporal": (self._temporal_request, self._build_temporal_matches),
+            "reflection": (self._reflection_request, self._build_reflection_matches)
+        }
+        # Without MSP's batch API the streams are independent round-trips, so they
+        # run concurrently on one long-lived pool (threads reused across retrieve() calls)
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._streams),
+            thread_name_prefix="agentic-rag"
+        )
+
+        # (physio bucket, tags, streams) -> (stored_at, undecayed matches); LRU + TTL
+        self._result_cache: "OrderedDict[tuple, Tuple[float, List[MemoryMatch]]]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        # Bumped by invalidate_result_cache; results fetched under an older value are not stored
+        self._result_cache_gen = 0
+        # Drop cached results whenever MSP stores a new episode
+        add_write_listener = getattr(msp_client, "add_write_listener", None)
+        if add_write_listener is not None:
+            add_write_listener(self.invalidate_result_cache)
+
     def retrieve(
         self,
         query_context: Dict[str, Any],
-        enabled_streams: Optional[List[str]] = None
+        enabled_streams: Optional[List[str]] = None,
+        top_k: Optional[int] = None
     ) -> List[MemoryMatch]:
         """
         Retrieve memories across all 7 streams
@@ -87,91 +192,192 @@ class AgenticRAG:
 
             enabled_streams: Optional list of stream names to use
                            (default: all 7 streams)
+            top_k: Optional cap on the number of matches returned
+                   (default: all matches)
 
         Returns:
             List[MemoryMatch] - Ranked memories from all streams
         """
         if enabled_streams is None:
-            enabled_streams = [
-                "narrative",
-                "salience",
-                "sensory",
-                "intuition",
-                "emotion",
-                "temporal",
-                "reflection"
-            ]
+            enabled = frozenset(self._ALL_STREAMS)
+        else:
+            enabled = frozenset(enabled_streams)
 
-        all_matches = []
+        # Similar queries (same physio bucket and tags) reuse the stream results
+        cache_key = self._cache_key(query_context, enabled)
+        all_matches = self._cache_get(cache_key)
 
-        # Query each enabled stream
-        if "narrative" in enabled_streams:
-            all_matches.extend(self._query_narrative_stream(query_context))
+        if all_matches is None:
+            generation = self._result_cache_gen
+            all_matches = self._query_streams(query_context, enabled)
+            self._cache_put(cache_key, all_matches, generation)
 
-        if "salience" in enabled_streams:
-            all_matches.extend(self._query_salience_stream(query_context))
+        # Apply temporal decay to all matches
+        all_matches = self._apply_temporal_decay(all_matches)
 
-        if "sensory" in enabled_streams:
-            all_matches.extend(self._query_sensory_stream(query_context))
+        # Rank by score (highest first); only the best top_k if requested
+        if top_k is not None:
+            return heapq.nlargest(top_k, all_matches, key=_score_getter)
 
-        if "intuition" in enabled_streams:
-            all_matches.extend(self._query_intuition_stream(query_context))
+        all_matches.sort(key=_score_getter, reverse=True)
+        return all_matches
 
-        if "emotion" in enabled_streams:
-            all_matches.extend(self._query_emotion_stream(query_context))
+    # ============================================================
+    # SEMANTIC RESULT CACHE
+    # ============================================================
 
-        if "temporal" in enabled_streams:
-            all_matches.extend(self._query_temporal_stream(query_context))
+    def _cache_key(self, context: Dict[str, Any], enabled: frozenset) -> Optional[tuple]:
+        """
+        Cache key for a query: physio signature quantized to 1/255 steps,
+        sorted tags and enabled streams (the only inputs the streams read).
+        None if the context cannot be keyed (non-numeric levels, unsortable tags).
+        """
+        try:
+            physio = self._build_physio_query(context)
+            bucket = bytes(int(round(max(0.0, min(1.0, v)) * 255)) for v in physio.values())
+            tags = tuple(sorted(context.get("tags") or ()))
+            key = (bucket, tags, enabled)
+            hash(key)
+            return key
+        except (TypeError, ValueError, AttributeError):
+            return None
+
+    def _cache_get(self, key: Optional[tuple]) -> Optional[List[MemoryMatch]]:
+        """Fresh copies of the cached, undecayed matches for key (None on miss/expiry)"""
+        if key is None:
+            return None
+        with self._result_cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            stored_at, matches = entry
+            if time.monotonic() - stored_at > _RESULT_CACHE_TTL:
+                del self._result_cache[key]
+                return None
+            self._result_cache.move_to_end(key)
+        # Decay mutates scores in place, so callers never see the cached objects
+        return [MemoryMatch(m.episode_id, m.stream, m.content, m.score, dict(m.metadata))
+                for m in matches]
+
+    def _cache_put(self, key: Optional[tuple], matches: List[MemoryMatch], generation: int):
+        """
+        Store undecayed copies of matches under key, evicting the least recently used.
+        Skipped if the cache was invalidated since `generation` was read.
+        """
+        if key is None:
+            return
+        stored = [MemoryMatch(m.episode_id, m.stream, m.content, m.score, dict(m.metadata))
+                  for m in matches]
+        with self._result_cache_lock:
+            if generation != self._result_cache_gen:
+                return
+            self._result_cache[key] = (time.monotonic(), stored)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > _RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+    def invalidate_result_cache(self):
+        """Forget all cached stream results (call after memory writes)"""
+        with self._result_cache_lock:
+            self._result_cache_gen += 1
+            self._result_cache.clear()
+
+    def _query_streams(self, context: Dict[str, Any], enabled: frozenset) -> List[MemoryMatch]:
+        """
+        Query the enabled streams with one MSP batch call and build their matches
+        (in _ALL_STREAMS order, so equal scores keep a stable ranking).
+        No MSP client -> no matches; a failing stream is logged and yields no matches.
+        """
+        if self.msp_client is None:
+            return []
 
-        if "reflection" in enabled_streams:
-            all_matches.extend(self._query_reflection_stream(query_context))
+        requests = []
+        for name in self._ALL_STREAMS:
+            if name in enabled:
+                try:
+                    requests.append(self._streams[name][0](context))
+                except Exception as e:
+                    logger.warning("[AgenticRAG] %s stream error: %s", name.capitalize(), e)
 
-        # Apply temporal decay to all matches
-        all_matches = self._apply_temporal_decay(all_matches)
+        results = self._fetch_stream_episodes(requests)
 
-        # Sort by score (highest first)
-        all_matches.sort(key=lambda m: m.score, reverse=True)
+        matches = []
+        for request in requests:
+            name = request["stream"]
+            episodes = results.get(name)
+            if episodes is None:
+                continue
+            try:
+                matches.extend(self._streams[name][1](episodes, request))
+            except Exception as e:
+                logger.warning("[AgenticRAG] %s stream error: %s", name.capitalize(), e)
+        return matches
 
-        return all_matches
+    def _fetch_stream_episodes(self, requests: List[Dict[str, Any]]) -> Dict[str, List[Dict]]:
+        """
+        Episodes per stream for the given requests: one query_multi_stream round-trip
+        if the MSP client has it, otherwise the per-stream queries run concurrently.
+        Streams that failed are missing from the result.
+        """
+        query_multi_stream = getattr(self.msp_client, "query_multi_stream", None)
+        if query_multi_stream is not None:
+            try:
+                return query_multi_stream(requests)
+            except Exception as e:
+                logger.warning("[AgenticRAG] Multi-stream query error: %s", e)
+                return {}
+
+        futures = [
+            (request["stream"], self._executor.submit(self._call_stream, request))
+            for request in requests
+        ]
+        results = {}
+        for name, future in futures:
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.warning("[AgenticRAG] %s stream error: %s", name.capitalize(), e)
+        return results
+
+    def _call_stream(self, request: Dict[str, Any]) -> List[Dict]:
+        """Run one stream request against its own MSP query method"""
+        params = dict(request)
+        name = params.pop("stream")
+        return getattr(self.msp_client, self._STREAM_QUERIES[name])(**params)
 
     # ============================================================
     # STREAM 1: NARRATIVE - Sequential Episode Chains
     # ============================================================
 
-    def _query_narrative_stream(self, context: Dict[str, Any]) -> List[MemoryMatch]:
+    def _narrative_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """MSP query for the Narrative stream"""
+        # Get episodes related by narrative continuity
+        return {
+            "stream": "narrative",
+            "tags": context.get("tags", []),
+            "limit": self.max_results_per_stream
+        }
+
+    def _build_narrative_matches(self, episodes: List[Dict], request: Dict[str, Any]) -> List[MemoryMatch]:
         """
         Retrieve memories from sequential episode chains
 
         Purpose: Find storylines, cause-effect sequences
         Strategy: Parent-child episode relationships, temporal ordering
         """
-        if self.msp_client is None:
-            return []
-
         matches = []
-        tags = context.get("tags", [])
 
-        try:
-            # Get episodes related by narrative continuity
-            episodes = self.msp_client.query_narrative_chain(
-                tags=tags,
-                limit=self.max_results_per_stream
-            )
-
-            for ep in episodes:
-                matches.append(MemoryMatch(
-                    episode_id=ep.get("episode_id", "unknown"),
-                    stream="narrative",
-                    content=ep.get("summary", "N/A"),
-                    score=ep.get("narrative_score", 0.5),
-                    metadata={
-                        "parent_id": ep.get("parent_episode_id"),
-                        "sequence_position": ep.get("sequence_pos")
-                    }
-                ))
-
-        except Exception as e:
-            print(f"[AgenticRAG] Narrative stream error: {e}")
+        for ep in episodes:
+            matches.append(MemoryMatch(
+                episode_id=ep.get("episode_id", "unknown"),
+                stream="narrative",
+                content=ep.get("summary", "N/A"),
+                score=ep.get("narrative_score", 0.5),
+                metadata={
+                    "parent_id": ep.get("parent_episode_id"),
+                    "sequence_position": ep.get("sequence_pos")
+                }
+            ))
 
         return matches
 
@@ -179,41 +385,36 @@ class AgenticRAG:
     # STREAM 2: SALIENCE - High-Impact Memories
     # ============================================================
 
-    def _query_salience_stream(self, context: Dict[str, Any]) -> List[MemoryMatch]:
+    def _salience_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """MSP query for the Salience stream"""
+        # Get high-RI episodes
+        return {
+            "stream": "salience",
+            "tags": context.get("tags", []),
+            "min_ri": 0.70,  # High salience threshold
+            "limit": self.max_results_per_stream
+        }
+
+    def _build_salience_matches(self, episodes: List[Dict], request: Dict[str, Any]) -> List[MemoryMatch]:
         """
         Retrieve high-impact, unforgettable memories
 
         Purpose: Find memories with high Resonance Index (RI)
         Strategy: Query by RI score, emotional intensity
         """
-        if self.msp_client is None:
-            return []
-
         matches = []
-        tags = context.get("tags", [])
 
-        try:
-            # Get high-RI episodes
-            episodes = self.msp_client.query_by_salience(
-                tags=tags,
-                min_ri=0.70,  # High salience threshold
-                limit=self.max_results_per_stream
-            )
-
-            for ep in episodes:
-                matches.append(MemoryMatch(
-                    episode_id=ep.get("episode_id", "unknown"),
-                    stream="salience",
-                    content=ep.get("summary", "N/A"),
-                    score=ep.get("resonance_index", 0.5),
-                    metadata={
-                        "ri_score": ep.get("resonance_index"),
-                        "intensity": ep.get("intensity")
-                    }
-                ))
-
-        except Exception as e:
-            print(f"[AgenticRAG] Salience stream error: {e}")
+        for ep in episodes:
+            matches.append(MemoryMatch(
+                episode_id=ep.get("episode_id", "unknown"),
+                stream="salience",
+                content=ep.get("summary", "N/A"),
+                score=ep.get("resonance_index", 0.5),
+                metadata={
+                    "ri_score": ep.get("resonance_index"),
+                    "intensity": ep.get("intensity")
+                }
+            ))
 
         return matches
 
@@ -221,41 +422,36 @@ class AgenticRAG:
     # STREAM 3: SENSORY - Sensory-Rich Memories
     # ============================================================
 
-    def _query_sensory_stream(self, context: Dict[str, Any]) -> List[MemoryMatch]:
+    def _sensory_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """MSP query for the Sensory stream"""
+        # Get episodes with high qualia intensity
+        return {
+            "stream": "sensory",
+            "tags": context.get("tags", []),
+            "min_qualia_intensity": 0.6,
+            "limit": self.max_results_per_stream
+        }
+
+    def _build_sensory_matches(self, episodes: List[Dict], request: Dict[str, Any]) -> List[MemoryMatch]:
         """
         Retrieve sensory-rich memories with strong qualia
 
         Purpose: Find memories with vivid sensory details
         Strategy: Qualia texture vector matching
         """
-        if self.msp_client is None:
-            return []
-
         matches = []
-        tags = context.get("tags", [])
 
-        try:
-            # Get episodes with high qualia intensity
-            episodes = self.msp_client.query_sensory_memories(
-                tags=tags,
-                min_qualia_intensity=0.6,
-                limit=self.max_results_per_stream
-            )
-
-            for ep in episodes:
-                matches.append(MemoryMatch(
-                    episode_id=ep.get("episode_id", "unknown"),
-                    stream="sensory",
-                    content=ep.get("summary", "N/A"),
-                    score=ep.get("qualia_score", 0.5),
-                    metadata={
-                        "qualia_texture": ep.get("qualia_texture"),
-                        "sensory_modalities": ep.get("sensory_modalities")
-                    }
-                ))
-
-        except Exception as e:
-            print(f"[AgenticRAG] Sensory stream error: {e}")
+        for ep in episodes:
+            matches.append(MemoryMatch(
+                episode_id=ep.get("episode_id", "unknown"),
+                stream="sensory",
+                content=ep.get("summary", "N/A"),
+                score=ep.get("qualia_score", 0.5),
+                metadata={
+                    "qualia_texture": ep.get("qualia_texture"),
+                    "sensory_modalities": ep.get("sensory_modalities")
+                }
+            ))
 
         return matches
 
@@ -263,41 +459,36 @@ class AgenticRAG:
     # STREAM 4: INTUITION - Pattern Recognition
     # ============================================================
 
-    def _query_intuition_stream(self, context: Dict[str, Any]) -> List[MemoryMatch]:
+    def _intuition_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """MSP query for the Intuition stream"""
+        # Get episodes through semantic graph patterns
+        return {
+            "stream": "intuition",
+            "tags": context.get("tags", []),
+            "pattern_type": "structural",
+            "limit": self.max_results_per_stream
+        }
+
+    def _build_intuition_matches(self, episodes: List[Dict], request: Dict[str, Any]) -> List[MemoryMatch]:
         """
         Retrieve memories based on pattern/structure similarity
 
         Purpose: Find structural patterns across experiences
         Strategy: Semantic graph traversal, concept relationships
         """
-        if self.msp_client is None:
-            return []
-
         matches = []
-        tags = context.get("tags", [])
 
-        try:
-            # Get episodes through semantic graph patterns
-            episodes = self.msp_client.query_semantic_patterns(
-                tags=tags,
-                pattern_type="structural",
-                limit=self.max_results_per_stream
-            )
-
-            for ep in episodes:
-                matches.append(MemoryMatch(
-                    episode_id=ep.get("episode_id", "unknown"),
-                    stream="intuition",
-                    content=ep.get("summary", "N/A"),
-                    score=ep.get("pattern_score", 0.5),
-                    metadata={
-                        "pattern_type": ep.get("pattern_type"),
-                        "concept_cluster": ep.get("concept_cluster")
-                    }
-                ))
-
-        except Exception as e:
-            print(f"[AgenticRAG] Intuition stream error: {e}")
+        for ep in episodes:
+            matches.append(MemoryMatch(
+                episode_id=ep.get("episode_id", "unknown"),
+                stream="intuition",
+                content=ep.get("summary", "N/A"),
+                score=ep.get("pattern_score", 0.5),
+                metadata={
+                    "pattern_type": ep.get("pattern_type"),
+                    "concept_cluster": ep.get("concept_cluster")
+                }
+            ))
 
         return matches
 
@@ -305,7 +496,17 @@ class AgenticRAG:
     # STREAM 5: EMOTION - Emotion-Congruent Recall (KEY!)
     # ============================================================
 
-    def _query_emotion_stream(self, context: Dict[str, Any]) -> List[MemoryMatch]:
+    def _emotion_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """MSP query for the Emotion stream"""
+        # Query MSP for episodes with similar physio traces
+        return {
+            "stream": "emotion",
+            "physio_query": self._build_physio_query(context),
+            "similarity_threshold": 0.7,  # 70% similarity
+            "limit": self.max_results_per_stream
+        }
+
+    def _build_emotion_matches(self, episodes: List[Dict], request: Dict[str, Any]) -> List[MemoryMatch]:
         """
         Retrieve memories matching current emotional/physiological state
 
@@ -323,57 +524,75 @@ class AgenticRAG:
             If current state: cortisol=0.8, ans_sympathetic=0.75 (stressed)
             Retrieve episodes: with similar stress signatures
         """
-        if self.msp_client is None:
-            return []
-
         matches = []
+        physio_query = request["physio_query"]
+
+        # Calculate emotion similarity scores for all candidates at once
+        emotion_scores = self._batch_emotion_similarity(
+            physio_query,
+            [ep.get("physio_trace", {}) for ep in episodes]
+        )
+
+        for ep, emotion_score in zip(episodes, emotion_scores):
+            matches.append(MemoryMatch(
+                episode_id=ep.get("episode_id", "unknown"),
+                stream="emotion",
+                content=ep.get("summary", "N/A"),
+                score=emotion_score,
+                metadata={
+                    "emotion_label": ep.get("emotion_label"),
+                    "physio_similarity": emotion_score,
+                    "physio_trace": ep.get("physio_trace")
+                }
+            ))
+
+        return matches
 
-        # Extract current physiological state
+    def _build_physio_query(self, context: Dict[str, Any]) -> Dict[str, float]:
+        """Current physio signature (keys in _PHYSIO_KEYS order) from ANS state and blood levels"""
         ans_state = context.get("ans_state", {})
         blood_levels = context.get("blood_levels", {})
-        receptor_signals = context.get("receptor_signals", {})
-
-        # Build physio query vector
-        physio_query = {
-            "ans_sympathetic": ans_state.get("sympathetic", 0.5),
-            "ans_parasympathetic": ans_state.get("parasympathetic", 0.5),
-            "cortisol": blood_levels.get("cortisol", 0.5),
-            "adrenaline": blood_levels.get("adrenaline", 0.3),
-            "dopamine": blood_levels.get("dopamine", 0.5),
-            "serotonin": blood_levels.get("serotonin", 0.5)
-        }
 
-        try:
-            # Query MSP for episodes with similar physio traces
-            episodes = self.msp_client.query_by_physio_state(
-                physio_query=physio_query,
-                similarity_threshold=0.7,  # 70% similarity
-                limit=self.max_results_per_stream
-            )
-
-            for ep in episodes:
-                # Calculate emotion similarity score
-                emotion_score = self._calculate_emotion_similarity(
-                    physio_query,
-                    ep.get("physio_trace", {})
-                )
-
-                matches.append(MemoryMatch(
-                    episode_id=ep.get("episode_id", "unknown"),
-                    stream="emotion",
-                    content=ep.get("summary", "N/A"),
-                    score=emotion_score,
-                    metadata={
-                        "emotion_label": ep.get("emotion_label"),
-                        "physio_similarity": emotion_score,
-                        "physio_trace": ep.get("physio_trace")
-                    }
-                ))
-
-        except Exception as e:
-            print(f"[AgenticRAG] Emotion stream error: {e}")
+        return dict(zip(self._PHYSIO_KEYS, (
+            ans_state.get("sympathetic", 0.5),
+            ans_state.get("parasympathetic", 0.5),
+            blood_levels.get("cortisol", 0.5),
+            blood_levels.get("adrenaline", 0.3),
+            blood_levels.get("dopamine", 0.5),
+            blood_levels.get("serotonin", 0.5)
+        )))
 
-        return matches
+    def _batch_emotion_similarity(
+        self,
+        physio_query: Dict[str, float],
+        past_states: List[Dict[str, float]]
+    ) -> List[float]:
+        """
+        _calculate_emotion_similarity of one physio query (all _PHYSIO_KEYS
+        present) against many past traces, as one (N,6) @ (6,) product
+
+        Traces are used as pre-normalized unit rows (_unit_trace), so only
+        the query norm is computed per call. Traces missing a key are
+        compared on their shared keys only, as in the pairwise version: the
+        query norm is taken per row over the keys that trace actually has.
+        """
+        if not NUMPY_AVAILABLE or not past_states:
+            return [self._calculate_emotion_similarity(physio_query, past)
+                    for past in past_states]
+
+        # float32 throughout: physio levels are in [0, 1] with ~2 significant decimals
+        keys = self._PHYSIO_KEYS
+        q = np.array([physio_query[k] for k in keys], dtype=np.float32)
+        rows = [tuple(past.get(k) for k in keys) for past in past_states]
+        units = np.array([_unit_trace(row) for row in rows], dtype=np.float32)
+        present = np.array([[v is not None for v in row] for row in rows], dtype=np.float32)
+
+        dots = units @ q
+        q_norms = np.sqrt(present @ (q * q))
+
+        # Zero-magnitude traces have zero unit rows; no shared key scores 0.0
+        scores = np.divide(dots, q_norms, out=np.zeros_like(dots), where=q_norms != 0)
+        return np.clip(scores, 0.0, 1.0).tolist()
 
     def _calculate_emotion_similarity(
         self,
@@ -392,20 +611,25 @@ class AgenticRAG:
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        # Extract common keys
-        keys = set(current_state.keys()) & set(past_state.keys())
-
-        if not keys:
-            return 0.0
-
-        # Build vectors
-        vec1 = [current_state[k] for k in keys]
-        vec2 = [past_state[k] for k in keys]
-
-        # Cosine similarity
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        mag1 = math.sqrt(sum(a * a for a in vec1))
-        mag2 = math.sqrt(sum(b * b for b in vec2))
+        # One pass over the smaller dict; keys missing from the other side are skipped
+        # (cosine is symmetric, so which side is iterated does not matter)
+        if len(past_state) < len(current_state):
+            small, large = past_state, current_state
+        else:
+            small, large = current_state, past_state
+
+        dot_product = sq1 = sq2 = 0.0
+        for k, a in small.items():
+            b = large.get(k)
+            if b is None:
+                continue
+            dot_product += a * b
+            sq1 += a * a
+            sq2 += b * b
+
+        # Cosine similarity (no shared key -> zero magnitudes -> 0.0)
+        mag1 = math.sqrt(sq1)
+        mag2 = math.sqrt(sq2)
 
         if mag1 == 0 or mag2 == 0:
             return 0.0
@@ -419,110 +643,105 @@ class AgenticRAG:
     # STREAM 6: TEMPORAL - Time-Based Context
     # ============================================================
 
-    def _query_temporal_stream(self, context: Dict[str, Any]) -> List[MemoryMatch]:
+    def _temporal_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """MSP query for the Temporal stream"""
+        # Get recent episodes (recency-biased)
+        return {
+            "stream": "temporal",
+            "tags": context.get("tags", []),
+            "within_days": 30,
+            "limit": self.max_results_per_stream
+        }
+
+    def _build_temporal_matches(self, episodes: List[Dict], request: Dict[str, Any]) -> List[MemoryMatch]:
         """
         Retrieve memories based on temporal proximity
 
         Purpose: Find recent or temporally-relevant memories
         Strategy: Time-based query, recency bias
         """
-        if self.msp_client is None:
-            return []
-
         matches = []
-        tags = context.get("tags", [])
 
-        try:
-            # Get recent episodes (recency-biased)
-            episodes = self.msp_client.query_recent_episodes(
-                tags=tags,
-                within_days=30,
-                limit=self.max_results_per_stream
-            )
-
-            for ep in episodes:
-                # Calculate recency score
-                timestamp = ep.get("timestamp")
-                recency_score = self._calculate_recency_score(timestamp)
-
-                matches.append(MemoryMatch(
-                    episode_id=ep.get("episode_id", "unknown"),
-                    stream="temporal",
-                    content=ep.get("summary", "N/A"),
-                    score=recency_score,
-                    metadata={
-                        "timestamp": timestamp,
-                        "days_ago": self._days_ago(timestamp)
-                    }
-                ))
-
-        except Exception as e:
-            print(f"[AgenticRAG] Temporal stream error: {e}")
+        now = datetime.now()
+        for ep in episodes:
+            # Calculate recency score (timestamp parsed once for both fields)
+            timestamp = ep.get("timestamp")
+            days_ago = self._elapsed_days(timestamp, now)
+            recency_score = self._recency_from_days(days_ago)
+
+            matches.append(MemoryMatch(
+                episode_id=ep.get("episode_id", "unknown"),
+                stream="temporal",
+                content=ep.get("summary", "N/A"),
+                score=recency_score,
+                metadata={
+                    "timestamp": timestamp,
+                    "days_ago": 999 if days_ago is None else days_ago
+                }
+            ))
 
         return matches
 
-    def _calculate_recency_score(self, timestamp: str) -> float:
-        """Calculate score based on how recent the memory is"""
+    def _elapsed_days(self, timestamp: str, now: Optional[datetime] = None) -> Optional[int]:
+        """Whole days since timestamp as of `now` (default: current time), None if unparsable"""
         try:
-            ts = datetime.fromisoformat(timestamp)
-            now = datetime.now()
-            days_ago = (now - ts).days
+            ts = _parse_iso(timestamp)
+            if now is None:
+                now = datetime.now()
+            return (now - ts).days
+        except (TypeError, ValueError):
+            return None
 
-            # Exponential decay based on recency
-            score = math.exp(-days_ago / self.decay_halflife_days)
-            return max(0.0, min(1.0, score))
+    def _recency_from_days(self, days_ago: Optional[int]) -> float:
+        """Exponential decay based on recency (0.5 if the timestamp was invalid)"""
+        if days_ago is None:
+            return 0.5
+        score = math.exp(-days_ago / self.decay_halflife_days)
+        return max(0.0, min(1.0, score))
 
-        except:
-            return 0.5  # Default if timestamp invalid
+    def _calculate_recency_score(self, timestamp: str, now: Optional[datetime] = None) -> float:
+        """Calculate score based on how recent the memory is"""
+        return self._recency_from_days(self._elapsed_days(timestamp, now))
 
-    def _days_ago(self, timestamp: str) -> int:
+    def _days_ago(self, timestamp: str, now: Optional[datetime] = None) -> int:
         """Calculate days since timestamp"""
-        try:
-            ts = datetime.fromisoformat(timestamp)
-            now = datetime.now()
-            return (now - ts).days
-        except:
-            return 999
+        days_ago = self._elapsed_days(timestamp, now)
+        return 999 if days_ago is None else days_ago
 
     # ============================================================
     # STREAM 7: REFLECTION - Meta-Cognitive Insights
     # ============================================================
 
-    def _query_reflection_stream(self, context: Dict[str, Any]) -> List[MemoryMatch]:
+    def _reflection_request(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """MSP query for the Reflection stream"""
+        # Get reflection episodes
+        return {
+            "stream": "reflection",
+            "tags": context.get("tags", []),
+            "reflection_type": "self_understanding",
+            "limit": self.max_results_per_stream
+        }
+
+    def _build_reflection_matches(self, episodes: List[Dict], request: Dict[str, Any]) -> List[MemoryMatch]:
         """
         Retrieve meta-cognitive reflections and self-understanding
 
         Purpose: Find moments of insight, self-awareness
         Strategy: Query reflection tags, meta-level summaries
         """
-        if self.msp_client is None:
-            return []
-
         matches = []
-        tags = context.get("tags", [])
 
-        try:
-            # Get reflection episodes
-            episodes = self.msp_client.query_reflections(
-                tags=tags,
-                reflection_type="self_understanding",
-                limit=self.max_results_per_stream
-            )
-
-            for ep in episodes:
-                matches.append(MemoryMatch(
-                    episode_id=ep.get("episode_id", "unknown"),
-                    stream="reflection",
-                    content=ep.get("summary", "N/A"),
-                    score=ep.get("reflection_depth", 0.5),
-                    metadata={
-                        "reflection_type": ep.get("reflection_type"),
-                        "insight_level": ep.get("insight_level")
-                    }
-                ))
-
-        except Exception as e:
-            print(f"[AgenticRAG] Reflection stream error: {e}")
+        for ep in episodes:
+            matches.append(MemoryMatch(
+                episode_id=ep.get("episode_id", "unknown"),
+                stream="reflection",
+                content=ep.get("summary", "N/A"),
+                score=ep.get("reflection_depth", 0.5),
+                metadata={
+                    "reflection_type": ep.get("reflection_type"),
+                    "insight_level": ep.get("insight_level")
+                }
+            ))
 
         return matches
 
@@ -538,36 +757,38 @@ class AgenticRAG:
             score_final = score_base * exp(-days_ago / halflife)
 
         Args:
-            matches: List of memory matches
+            matches: List of memory matches (scores are updated in place)
 
         Returns:
-            List of matches with decayed scores
+            The same list, with decayed scores
         """
-        decayed_matches = []
-
-        for match in matches:
+        # Parse each timestamp once against a single "now"; no decay (factor 1.0) if no timestamp
+        now = datetime.now()
+        decay_factors = [1.0] * len(matches)
+        timed = []  # (match index, days_ago)
+        for i, match in enumerate(matches):
             timestamp = match.metadata.get("timestamp")
-
             if timestamp:
-                decay_factor = self._calculate_recency_score(timestamp)
-            else:
-                decay_factor = 1.0  # No decay if no timestamp
-
-            # Apply decay
-            decayed_score = match.score * decay_factor
+                days_ago = self._elapsed_days(timestamp, now)
+                if days_ago is None:
+                    decay_factors[i] = 0.5  # Default if timestamp invalid
+                else:
+                    timed.append((i, days_ago))
+
+        if NUMPY_AVAILABLE and len(timed) >= _NUMPY_DECAY_MIN:
+            days = np.array([d for _, d in timed], dtype=np.float64)
+            factors = np.clip(np.exp(-days / self.decay_halflife_days), 0.0, 1.0).tolist()
+            for (i, _), factor in zip(timed, factors):
+                decay_factors[i] = factor
+        else:
+            for i, days_ago in timed:
+                decay_factors[i] = self._recency_from_days(days_ago)
+
+        # Apply decay in place (matches are freshly built per retrieve call)
+        for match, decay_factor in zip(matches, decay_factors):
+            match.score *= decay_factor
 
-            # Create new match with decayed score
-            decayed_match = MemoryMatch(
-                episode_id=match.episode_id,
-                stream=match.stream,
-                content=match.content,
-                score=decayed_score,
-                metadata=match.metadata
-            )
-
-            decayed_matches.append(decayed_match)
-
-        return decayed_matches
+        return matches
 
 
 # ============================================================
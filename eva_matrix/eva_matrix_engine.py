@@ -4,9 +4,152 @@ Psyche Core with state ownership and persistence.
 """
 
 from pathlib import Path
+import os
 import json
+import math
+import mmap
+import time
+import pickle
+import queue
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+from operator import itemgetter
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, Union, Sequence
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Neural signals: {name: value}, or parallel (names, values) with values a sequence/np.ndarray
+Signals = Union[Dict[str, float], Tuple[Sequence[str], Sequence[float]]]
+
+# Changed turns coalesced into one state write (flush() persists the remainder)
+_SAVE_EVERY_TURNS = 8
+
+# _dominant_signal uses a NumPy argmax from this many signals up
+_NUMPY_ARGMAX_MIN = 32
+
+
+def _dumps_state(data: Dict[str, Any]) -> bytes:
+    """Serialize the persisted state as indented UTF-8 JSON bytes (NumPy values allowed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _json_default(obj):
+    """Stdlib json fallback for NumPy scalars/arrays (what OPT_SERIALIZE_NUMPY covers)"""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _loads_state(raw: bytes) -> Dict[str, Any]:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last _utc_now_iso() call
+_NOW_CACHE = (None, "")
+
+
+def _utc_now_iso() -> str:
+    """datetime.now(timezone.utc).isoformat(), formatting the date/time part once per second"""
+    global _NOW_CACHE
+    t = time.time()
+    sec = int(t)
+    cached_sec, prefix = _NOW_CACHE
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _NOW_CACHE = (sec, prefix)
+    usec = int((t - sec) * 1_000_000)
+    if usec:
+        return f"{prefix}.{usec:06d}+00:00"
+    return prefix + "+00:00"
+
+
+# _read_state_file memory-maps files larger than this instead of reading them
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def _read_state_file(path: Path) -> Dict[str, Any]:
+    """Parse the state file; large files are parsed straight from a read-only mapping"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size > _MMAP_MIN_SIZE:
+            with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mm:
+                if not ORJSON_AVAILABLE:
+                    return json.loads(mm[:])
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size, 1 << 16))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return _loads_state(b"".join(chunks))
+    finally:
+        os.close(fd)
+
+
+# Globals the binary state sidecar may reference (NumPy array reconstruction only)
+_SIDECAR_GLOBALS = frozenset({"_frombuffer", "_reconstruct", "dtype", "ndarray", "scalar"})
+
+
+class _SidecarUnpickler(pickle.Unpickler):
+    """Unpickler for eva_matrix_state.bin: refuses every global except NumPy's array rebuilders"""
+
+    def find_class(self, module, name):
+        if module.partition(".")[0] == "numpy" and name in _SIDECAR_GLOBALS:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in the state sidecar")
+
+
+# Persisted/external psyche state fields, with defaults for missing keys
+_STATE_DEFAULTS = {
+    "axes_9d": {},
+    "momentum": {},
+    "emotion_label": "Neutral",
+}
+_STATE_GET = itemgetter(*_STATE_DEFAULTS)
+_TRANSITION_GET = itemgetter("axes_9d", "emotion_label", "momentum")
+
+
+@dataclass(slots=True)
+class PsycheState:
+    """Psyche state payload as stored on disk / exchanged via MSP."""
+    axes_9d: Dict[str, Any]
+    momentum: Dict[str, Any]
+    emotion_label: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PsycheState":
+        axes, momentum, label = _STATE_GET({**_STATE_DEFAULTS, **data})
+        # Never hand out the shared default dicts as owned state
+        if momentum is _STATE_DEFAULTS["momentum"]:
+            momentum = {}
+        if axes is _STATE_DEFAULTS["axes_9d"]:
+            axes = {}
+        return cls(axes, momentum, label)
 
 
 class EVAMatrixSystem:
@@ -19,27 +162,71 @@ class EVAMatrixSystem:
     - Persists state to disk
     - Owns the matrix_state slot
     - Uses internal calculation logic
+
+    axes_9d is the owned axes dict; axes_9d_arr is a fixed-order vector snapshot
+    of it (AXIS_NAMES order, NaN = axis not set) for numeric consumers.
     """
 
-    def __init__(self, base_path: Path = None, msp=None):
+    # The 9 psyche axes in axes vector order (EVA_Matrix_configs.yaml dimension_mapping)
+    AXIS_NAMES = (
+        "stress",
+        "warmth",
+        "drive",
+        "clarity",
+        "joy",
+        "alertness",
+        "connection",
+        "groundedness",
+        "openness"
+    )
+    _AXIS_INDEX = {name: i for i, name in enumerate(AXIS_NAMES)}
+
+    def __init__(self, base_path: Path = None, msp=None, binary_sidecar: bool = False):
         self.base_path = base_path or Path(".")
         self.msp = msp
         self.state_file = self.base_path / "consciousness/10_state/eva_matrix_state.json"
+        # Opt-in binary copy of the state (pickle protocol 5), preferred on load when it
+        # is at least as new as the JSON file. It costs a second fsynced write per save,
+        # so it only pays off where loads outnumber saves; the JSON is always written
+        self.state_bin_file = self.state_file.with_suffix(".bin") if binary_sidecar else None
 
         # Owned state (system authority)
-        self.axes_9d = {}
+        self._axes: Dict[str, Any] = {}
+        self._axes_version = 0  # bumped whenever axes_9d is assigned
         self.momentum = {}
         self.emotion_label = "Neutral"
 
+        # Last transition, reused while the signals (and owned state) are unchanged
+        self._last_signals_key = None
+        self._last_axes_version = None
+        self._last_result: Dict[str, Any] = None
+
+        # Last dominant signal name and its emotion label (skips re-titling)
+        self._last_dominant = (None, "Neutral")
+
+        # Write coalescing: persist every _SAVE_EVERY_TURNS changed turns (and on flush)
+        self._dirty = False
+        self._turns_since_save = 0
+
+        # Latest-wins persistence: _save_state only enqueues a snapshot,
+        # a daemon thread writes it (a newer snapshot replaces an unwritten one)
+        self._save_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._save_thread = threading.Thread(
+            target=self._save_worker, name="eva-matrix-save", daemon=True
+        )
+        self._save_thread.start()
+        atexit.register(self.flush)
+
         self._load_state()
-        print(f"[EVA Matrix System] Initialized (Psyche Core)")
+        logger.info("[EVA Matrix System] Initialized (Psyche Core)")
     
-    def process_signals(self, signals: Dict[str, float] = None) -> Dict[str, Any]:
+    def process_signals(self, signals: Signals = None) -> Dict[str, Any]:
         """
         Process neural signals and update psyche state.
 
         Args:
-            signals: Optional override for neural signals. If None, pulled from MSP.
+            signals: Optional override for neural signals, either a {name: value} dict
+                     or a parallel (names, values) pair. If None, pulled from MSP.
 
         Returns:
             Dict containing axes_9d, emotion_label, etc.
@@ -48,13 +235,29 @@ class EVAMatrixSystem:
         if signals is None and self.msp:
             signals = self.msp.get_active_state("neural_signals") or {}
 
-        # 2. Use internal calculation method
-        result = self._calculate_state_transition(signals or {})
+        # 2. Use internal calculation method (skipped when nothing changed since the last call)
+        signals = signals or {}
+        signals_key = self._signals_key(signals)
+        last = self._last_result
+        unchanged = (
+            signals_key is not None
+            and signals_key == self._last_signals_key
+            and last is not None
+            and self._axes_version == self._last_axes_version
+            and last.get("momentum") is self.momentum
+            and last.get("emotion_label") == self.emotion_label
+        )
+
+        if unchanged:
+            result = last
+        else:
+            result = self._calculate_state_transition(signals)
 
-        # 3. Update owned state
-        self.axes_9d = result.get("axes_9d", {})
-        self.emotion_label = result.get("emotion_label", "Neutral")
-        self.momentum = result.get("momentum", {})
+            # 3. Update owned state (the transition always fills all three keys)
+            self.axes_9d, self.emotion_label, self.momentum = _TRANSITION_GET(result)
+            self._last_signals_key = signals_key
+            self._last_axes_version = self._axes_version
+            self._last_result = result
 
         # 4. PUSH to State Bus (Phase 4)
         if self.msp:
@@ -62,15 +265,95 @@ class EVAMatrixSystem:
                 "axes_9d": self.axes_9d,
                 "emotion_label": self.emotion_label,
                 "momentum": self.momentum,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": _utc_now_iso()
             })
             # Also push reflex directives (Safety Reflex)
             self.msp.set_active_state("reflex_directives", result.get("reflex_directives", {}))
 
-        self._save_state()
+        if not unchanged:
+            self._dirty = True
+            self._turns_since_save += 1
+            if self._turns_since_save >= _SAVE_EVERY_TURNS:
+                self._save_state()
         return result
 
-    def _calculate_state_transition(self, signals: Dict[str, float]) -> Dict[str, Any]:
+    @property
+    def axes_9d(self) -> Dict[str, Any]:
+        """Owned axes dict (in-place edits are kept and persisted)."""
+        return self._axes
+
+    @axes_9d.setter
+    def axes_9d(self, axes: Dict[str, Any]):
+        self._axes = axes if axes is not None else {}
+        self._axes_version += 1
+
+    @property
+    def axes_9d_arr(self):
+        """The nine axes as a vector in AXIS_NAMES order (NaN = not set); a fresh snapshot."""
+        return self._split_axes(self._axes)[0]
+
+    def _split_axes(self, axes: Dict[str, Any]):
+        """(axes vector, extra keys) for an axes dict"""
+        arr = self._empty_axes()
+        extra = {}
+        index = self._AXIS_INDEX
+        for key, value in axes.items():
+            i = index.get(key)
+            if i is not None and isinstance(value, (int, float)) and not isinstance(value, bool):
+                arr[i] = value
+            else:
+                extra[key] = value
+        return arr, extra
+
+    def _join_axes(self, arr, extra: Dict[str, Any]) -> Dict[str, Any]:
+        """Inverse of _split_axes: set axes in AXIS_NAMES order, then the extra keys"""
+        axes = {name: float(v) for name, v in zip(self.AXIS_NAMES, arr) if v == v}
+        axes.update(extra)
+        return axes
+
+    def _empty_axes(self):
+        """Axes vector with every axis unset (NaN)"""
+        if NUMPY_AVAILABLE:
+            return np.full(len(self.AXIS_NAMES), np.nan)
+        return [math.nan] * len(self.AXIS_NAMES)
+
+    @staticmethod
+    def _signals_key(signals: Signals):
+        """Order-independent key of the signal values (None if they cannot be keyed)"""
+        try:
+            if isinstance(signals, dict):
+                return tuple(sorted(signals.items()))
+            names, values = signals
+            if NUMPY_AVAILABLE and isinstance(values, np.ndarray):
+                values = values.tolist()
+            return tuple(sorted(zip(names, values)))
+        except (TypeError, ValueError):
+            return None  # unorderable/unhashable input: always recompute
+
+    @staticmethod
+    def _dominant_signal(signals: Signals) -> Tuple[str, float]:
+        """(name, value) of the signal with the largest magnitude; first one wins ties"""
+        if isinstance(signals, dict):
+            names, values = tuple(signals), signals.values()
+        else:
+            names, values = signals
+        n = len(names)
+        if n == 0:
+            return "neutral", 0
+
+        if NUMPY_AVAILABLE and (n >= _NUMPY_ARGMAX_MIN or isinstance(values, np.ndarray)):
+            # SoA: one vectorized reduction instead of a key lambda per signal
+            if not isinstance(values, np.ndarray):
+                values = np.fromiter(values, dtype=np.float64, count=n)
+            i = int(np.argmax(np.abs(values)))
+            return names[i], float(values[i])
+
+        if isinstance(signals, dict):
+            return max(signals.items(), key=lambda x: abs(x[1]))
+        i = max(range(n), key=lambda j: abs(values[j]))
+        return names[i], values[i]
+
+    def _calculate_state_transition(self, signals: Signals) -> Dict[str, Any]:
         """
         Internal state transition calculation.
         Uses simplified logic without external library dependency.
@@ -85,19 +368,22 @@ class EVAMatrixSystem:
         # For now, maintain current state with minor updates
         # TODO: Implement full 9D matrix transformation logic when needed
 
-        # Update axes_9d based on signals (simplified)
-        updated_axes = self.axes_9d.copy()
-
         # Basic emotion classification based on signals
         emotion = "Neutral"
         if signals:
             # Simple heuristic: classify based on dominant signal
-            max_signal = max(signals.items(), key=lambda x: abs(x[1]), default=("neutral", 0))
-            if max_signal[1] > 0.7:
-                emotion = max_signal[0].title()
+            max_name, max_value = self._dominant_signal(signals)
+            if max_value > 0.7:
+                last_name, last_emotion = self._last_dominant
+                if max_name != last_name:
+                    last_emotion = max_name.title()
+                    self._last_dominant = (max_name, last_emotion)
+                emotion = last_emotion
 
         return {
-            "axes_9d": updated_axes,
+            # Axes are not transformed yet, so hand back the owned dict (the
+            # caller reassigns it to self.axes_9d); no per-frame copy
+            "axes_9d": self.axes_9d,
             "emotion_label": emotion,
             "momentum": self.momentum
         }
@@ -118,38 +404,124 @@ class EVAMatrixSystem:
             state_data: Dict containing axes_9d, momentum, emotion_label
         """
         if state_data:
-            self.axes_9d = state_data.get("axes_9d", {})
-            self.momentum = state_data.get("momentum", {})
-            self.emotion_label = state_data.get("emotion_label", "Neutral")
-            print(f"[EVA Matrix] Loaded external state: {self.emotion_label}")
+            self._apply_state(PsycheState.from_dict(state_data))
+            logger.debug("[EVA Matrix] Loaded external state: %s", self.emotion_label)
     
     def set_state(self, state_data: Dict[str, Any]):
         """Alias for load_state (for backward compatibility)."""
         self.load_state(state_data)
     
     def _load_state(self):
-        """Load state from persistence."""
+        """Load state from persistence (binary sidecar first, then JSON)."""
+        if self._load_binary_state():
+            logger.info("[EVA Matrix] Loaded state: %s", self.emotion_label)
+            return
         if self.state_file.exists():
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.axes_9d = data.get("axes_9d", {})
-                    self.momentum = data.get("momentum", {})
-                    self.emotion_label = data.get("emotion_label", "Neutral")
-                    print(f"[EVA Matrix] Loaded state: {self.emotion_label}")
+                self._apply_state(PsycheState.from_dict(_read_state_file(self.state_file)))
+                logger.info("[EVA Matrix] Loaded state: %s", self.emotion_label)
             except Exception as e:
-                print(f"[EVA Matrix] Warning: Could not load state: {e}")
+                logger.warning("[EVA Matrix] Could not load state: %s", e)
     
-    def _save_state(self):
-        """Save state to persistence."""
+    def _load_binary_state(self) -> bool:
+        """Adopt the binary sidecar if it exists and is not older than the JSON file."""
+        if self.state_bin_file is None:
+            return False
+        try:
+            bin_mtime = os.stat(self.state_bin_file).st_mtime_ns
+        except OSError:
+            return False
+        try:
+            if os.stat(self.state_file).st_mtime_ns > bin_mtime:
+                return False  # JSON written later (e.g. by a build without the sidecar)
+        except OSError:
+            pass
         try:
-            self.state_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "axes_9d": self.axes_9d,
-                    "momentum": self.momentum,
-                    "emotion_label": self.emotion_label,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
-                }, f, indent=2, ensure_ascii=False)
+            with open(self.state_bin_file, 'rb') as f:
+                axes, extra, momentum, label = _SidecarUnpickler(f).load()
+            if len(axes) != len(self.AXIS_NAMES):
+                raise ValueError(f"expected {len(self.AXIS_NAMES)} axes, got {len(axes)}")
         except Exception as e:
-            print(f"[EVA Matrix] Warning: Could not save state: {e}")
+            logger.warning("[EVA Matrix] Could not load binary state, using JSON: %s", e)
+            return False
+        self.axes_9d = self._join_axes(axes, extra)
+        self.momentum = momentum
+        self.emotion_label = label
+        return True
+
+    def _apply_state(self, state: PsycheState):
+        """Adopt a loaded state as the owned state."""
+        self.axes_9d = state.axes_9d
+        self.momentum = state.momentum
+        self.emotion_label = state.emotion_label
+
+    def _save_state(self):
+        """Queue the current state for persistence (written by the save thread)."""
+        snapshot = {
+            "axes_9d": dict(self.axes_9d),
+            "momentum": dict(self.momentum),
+            "emotion_label": self.emotion_label,
+            "timestamp": _utc_now_iso()
+        }
+        # Sidecar payload: the axes as a vector (NumPy pickles it as a PickleBuffer),
+        # split from the same dict the JSON gets so both files always agree
+        binary = None
+        if self.state_bin_file is not None:
+            binary = (
+                *self._split_axes(snapshot["axes_9d"]),
+                snapshot["momentum"], self.emotion_label
+            )
+        item = (snapshot, binary)
+        self._dirty = False
+        self._turns_since_save = 0
+        while True:
+            try:
+                self._save_queue.put_nowait(item)
+                return
+            except queue.Full:
+                # Drop the older unwritten snapshot, this one supersedes it
+                try:
+                    self._save_queue.get_nowait()
+                    self._save_queue.task_done()
+                except queue.Empty:
+                    pass
+
+    def _save_worker(self):
+        """Write queued snapshots: JSON first, then the binary sidecar (so it is never older)."""
+        while True:
+            snapshot, binary = self._save_queue.get()
+            try:
+                self._write_atomic(self.state_file, _dumps_state(snapshot))
+                if binary is not None:
+                    self._write_atomic(self.state_bin_file, pickle.dumps(binary, protocol=5))
+            except Exception as e:
+                logger.warning("[EVA Matrix] Could not save state: %s", e)
+            finally:
+                self._save_queue.task_done()
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        """Write data atomically (fsynced tmp file + os.replace)."""
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        # Encode up front: the file only sees one pre-built buffer
+        buf = memoryview(data)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        try:
+            fd = os.open(tmp_path, flags, 0o644)
+        except FileNotFoundError:
+            # First save (or directory removed): create it, then retry
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp_path, flags, 0o644)
+        try:
+            while buf:
+                buf = buf[os.write(fd, buf):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+
+    def flush(self):
+        """Persist any unsaved state and block until it has been written."""
+        if self._dirty:
+            self._save_state()
+        self._save_queue.join()
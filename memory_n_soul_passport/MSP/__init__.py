@@ -0,0 +1,5 @@
+"""MSP Package - Memory & Soul Passport Engine"""
+
+from .msp_engine import MSP
+
+__all__ = ["MSP"]
@@ -0,0 +1,53 @@
+"""
+Scoring kernels for the in-process emotion index (episodic.py).
+Compiled with Numba when it is installed; plain NumPy otherwise.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Below this many rows a single BLAS matvec beats the parallel kernel's thread start-up
+_NUMBA_MIN_ROWS = 4096
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _row_dots(mat, q):
+        """mat @ q with rows split across threads (fastmath: FMA/SIMD on the inner axis)"""
+        n, d = mat.shape
+        out = np.empty(n, np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += mat[i, j] * q[j]
+            out[i] = acc
+        return out
+
+
+def topk_cosine(mat: np.ndarray, q: np.ndarray, threshold: float, k: int):
+    """
+    Top-k rows of `mat` by cosine similarity to `q`, keeping only scores >= threshold.
+    Rows of `mat` and `q` must already be unit-norm float32 (so cosine = dot product).
+
+    Returns:
+        (row indices as int64, their scores as float32), best first
+    """
+    n = mat.shape[0]
+    if n == 0 or k <= 0:
+        return np.empty(0, np.int64), np.empty(0, np.float32)
+
+    if NUMBA_AVAILABLE and n >= _NUMBA_MIN_ROWS:
+        scores = _row_dots(mat, q)
+    else:
+        scores = mat @ q
+
+    if k < n:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(n)
+    top = top[np.argsort(-scores[top], kind="stable")]
+    top = top[scores[top] >= threshold]
+    return top.astype(np.int64, copy=False), scores[top]
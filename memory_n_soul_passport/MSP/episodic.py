@@ -1,31 +1,289 @@
+import re
+import logging
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+try:
+    import numpy as np
+    from ._kernels import topk_cosine
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Fields the remote stores should index so queries never fall back to a scan
+MONGO_EPISODE_INDEXES = [
+    [("episode_id", 1)],
+    [("state_snapshot.EVA_matrix.emotion_label", 1)],
+    [("turn_1.semantic_frames", 1)],
+    [("event_label", 1)],
+    [("episode_tag", 1)],
+    [("session_id", 1), ("timestamp", -1)],
+]
+NEO4J_EPISODE_INDEXES = [
+    "CREATE INDEX episode_emotion_label IF NOT EXISTS FOR (e:Episode) ON (e.emotion_label)",
+    "CREATE INDEX tag_name IF NOT EXISTS FOR (t:Tag) ON (t.name)",
+]
+
+# EVA 9D axes of an emotion texture, in column order of the in-process emotion index
+EMOTION_AXES = (
+    "stress", "warmth", "drive", "clarity", "joy",
+    "alertness", "connection", "groundedness", "openness",
+)
+_EMOTION_AXIS_INDEX = {axis: i for i, axis in enumerate(EMOTION_AXES)}
+
+# Remote query cache: entries kept, and the cosine between int8-quantized emotion
+# vectors at which a cached result is reused for a new query
+_QUERY_CACHE_SIZE = 128
+_QUERY_CACHE_MIN_COSINE = 0.98
+
 class EpisodicMemory:
     """Simplified Episodic Memory - delegates to MSP core"""
     def __init__(self, msp):
         self.msp = msp
+        # Emotion index fed by write_texture: unit-norm float32 rows (capacity grows
+        # by doubling) with parallel episode ids, scored by one matmul per query
+        self._emo_ids: List[str] = []
+        self._emo_rows: Dict[str, int] = {}
+        self._emo_mat = np.empty((0, len(EMOTION_AXES)), np.float32) if NUMPY_AVAILABLE else None
+        # LRU of remote query results: ("emotion", int8 vector bytes, other fields,
+        # threshold, limit) / ("tags", sorted tags, limit) -> episodes
+        self._sim_cache: "OrderedDict[tuple, list]" = OrderedDict()
 
     def write(self, episode_data: Dict[str, Any], ri_level: str = "L3") -> str:
         """Delegate to MSP core"""
         return self.msp.write_episode(episode_data, ri_level)
 
     def write_texture(self, episode_id: str, texture_data: Dict[str, float]):
-        """Store emotion texture in sensory sidecar"""
-        return self.msp.sensory.write_texture(episode_id, texture_data)
+        """Store emotion texture in sensory sidecar (and in the in-process emotion index)"""
+        result = self.msp.sensory.write_texture(episode_id, texture_data)
+        self._index_emotion(episode_id, texture_data)
+        self.invalidate_query_cache()
+        return result
 
     def write_embedding(self, episode_id: str, user_text: str, eva_text: str, model: str = "qwen3-embedding:0.6b"):
         """Placeholder - handled by MSP core now"""
-        print(f"[EpisodicMemory] Embedding for {episode_id} (handled by MSP core)")
+        logger.debug("[EpisodicMemory] Embedding for %s (handled by MSP core)", episode_id)
 
     def query_by_emotion(self, emotion_vec: Dict[str, float], threshold: float = 0.6, limit: int = 5):
-        """Query episodes by emotion similarity via MongoBridge"""
+        """
+        Query episodes by emotion similarity. While the in-process index holds a
+        texture for every stored episode, it answers alone (cosine similarity >=
+        threshold, fetched by ID); otherwise, or when it has no match, the
+        MongoBridge similarity scan runs over the whole store.
+        """
         if self.msp.mongo_bridge:
-            return self.msp.mongo_bridge.query_episodes_by_emotion_state(emotion_vec, limit)
+            key = self._emotion_cache_key(emotion_vec, threshold, limit)
+            cached = self._cache_lookup(key)
+            if cached is not None:
+                return cached
+            episodes = None
+            episode_ids = None
+            if self._emotion_index_complete():
+                episode_ids = self._match_emotion_index(emotion_vec, threshold, limit)
+            if episode_ids:
+                episodes = self._find_episodes_by_ids(episode_ids)
+            if not episodes:
+                episodes = self.msp.mongo_bridge.query_episodes_by_emotion_state(emotion_vec, limit)
+            self._cache_store(key, episodes)
+            return episodes
         return []
 
     def query_by_tags(self, tags: List[str], limit: int = 5):
-        """Query episodes by semantic tags via MongoBridge"""
+        """Query episodes by semantic tags via MongoBridge (cached per sorted tag set)"""
+        if self.msp.mongo_bridge:
+            try:
+                key = ("tags", tuple(sorted(tags)), limit)
+                hash(key)
+            except TypeError:
+                key = None
+            cached = self._cache_lookup(key)
+            if cached is not None:
+                return cached
+            episodes = self.msp.mongo_bridge.query_episodes_by_tags(tags, limit)
+            self._cache_store(key, episodes)
+            return episodes
+        return []
+
+    def invalidate_query_cache(self):
+        """Drop cached query results (call after episodes or textures are written)"""
+        self._sim_cache.clear()
+
+    def query_by_emotion_label(self, label: str, limit: int = 5):
+        """Query episodes by emotion label via MongoBridge (indexed field)"""
         if self.msp.mongo_bridge:
-            return self.msp.mongo_bridge.query_episodes_by_tags(tags, limit)
+            return self._find_episodes({"state_snapshot.EVA_matrix.emotion_label": label}, limit)
         return []
+
+    def query_by_event(self, event_label: str, limit: int = 10):
+        """Query episodes by narrative event via MongoBridge (indexed field)"""
+        if self.msp.mongo_bridge:
+            return self._find_episodes({"event_label": self._ci_contains(event_label)}, limit)
+        return []
+
+    def query_by_episode_name(self, name: str, limit: int = 5):
+        """Query episodes by episode tag/name via MongoBridge (indexed field)"""
+        if self.msp.mongo_bridge:
+            return self._find_episodes({"episode_tag": self._ci_contains(name)}, limit)
+        return []
+
+    def ensure_indexes(self):
+        """Create the secondary indexes used by the remote query paths (idempotent)"""
+        mongo = self.msp.mongo_bridge
+        if mongo:
+            if hasattr(mongo, 'ensure_indexes'):
+                mongo.ensure_indexes()
+            elif getattr(mongo, 'db', None) is not None:
+                try:
+                    for keys in MONGO_EPISODE_INDEXES:
+                        mongo.db.episodes.create_index(keys)
+                except Exception as e:
+                    logger.warning("[EpisodicMemory] Mongo index creation failed: %s", e)
+
+        neo4j = self.msp.neo4j_bridge
+        if neo4j and getattr(neo4j, 'driver', None):
+            try:
+                with neo4j.driver.session() as session:
+                    for stmt in NEO4J_EPISODE_INDEXES:
+                        session.run(stmt)
+            except Exception as e:
+                logger.warning("[EpisodicMemory] Neo4j index creation failed: %s", e)
+
+    @staticmethod
+    def _emotion_unit(emotion_vec: Dict[str, Any]):
+        """Unit-norm float32 EMOTION_AXES vector (missing axes = 0), None if all zero"""
+        vec = np.zeros(len(EMOTION_AXES), np.float32)
+        for key, value in emotion_vec.items():
+            i = _EMOTION_AXIS_INDEX.get(key)
+            if i is not None and isinstance(value, (int, float)) and not isinstance(value, bool):
+                vec[i] = value
+        norm = float(np.linalg.norm(vec))
+        if not norm or norm != norm:
+            return None
+        vec /= norm
+        return vec
+
+    def _index_emotion(self, episode_id: str, texture_data: Dict[str, Any]):
+        """Add (or replace) an episode's row in the emotion index"""
+        if not NUMPY_AVAILABLE or not isinstance(texture_data, dict):
+            return
+        row = self._emotion_unit(texture_data)
+        if row is None:
+            return
+        i = self._emo_rows.get(episode_id)
+        if i is None:
+            i = len(self._emo_ids)
+            if i == len(self._emo_mat):
+                grown = np.empty((max(16, 2 * i), len(EMOTION_AXES)), np.float32)
+                grown[:i] = self._emo_mat[:i]
+                self._emo_mat = grown
+            self._emo_ids.append(episode_id)
+            self._emo_rows[episode_id] = i
+        self._emo_mat[i] = row
+
+    def _emotion_index_complete(self) -> bool:
+        """
+        True when the index covers every episode in Mongo. It only sees textures
+        written through this process, so after a restart (or writes from another
+        process) its hits would be biased toward recent local episodes.
+        """
+        if not self._emo_ids:
+            return False
+        try:
+            total = self.msp.mongo_bridge.db.episodes.estimated_document_count()
+        except Exception as e:
+            logger.debug("[EpisodicMemory] Episode count unavailable, using Mongo scan: %s", e)
+            return False
+        return len(self._emo_ids) >= total
+
+    def _match_emotion_index(self, emotion_vec: Dict[str, Any], threshold: float, limit: int) -> List[str]:
+        """IDs of the top `limit` indexed episodes with cosine similarity >= threshold, best first"""
+        n = len(self._emo_ids)
+        if not NUMPY_AVAILABLE or n == 0 or limit <= 0:
+            return []
+        query = self._emotion_unit(emotion_vec)
+        if query is None:
+            return []
+        top, _ = topk_cosine(self._emo_mat[:n], query, threshold, limit)
+        return [self._emo_ids[i] for i in top.tolist()]
+
+    @staticmethod
+    def _emotion_cache_key(emotion_vec: Dict[str, Any], threshold: float, limit: int) -> Optional[tuple]:
+        """Cache key with the EMOTION_AXES values quantized to int8 (None = do not cache)"""
+        if not NUMPY_AVAILABLE:
+            return None
+        try:
+            vec = np.zeros(len(EMOTION_AXES), np.float32)
+            other = []
+            for key, value in emotion_vec.items():
+                i = _EMOTION_AXIS_INDEX.get(key)
+                if i is not None and isinstance(value, (int, float)) and not isinstance(value, bool):
+                    vec[i] = value
+                else:
+                    other.append((key, value))
+            quantized = np.rint(np.clip(vec, -1.0, 1.0) * 127).astype(np.int8)
+            key = ("emotion", quantized.tobytes(), tuple(sorted(other)), threshold, limit)
+            hash(key)
+            return key
+        except (TypeError, ValueError):
+            return None
+
+    def _cache_lookup(self, key: Optional[tuple]) -> Optional[list]:
+        """
+        Cached result for key; emotion keys also reuse the closest cached vector
+        with the same other fields if its cosine is >= _QUERY_CACHE_MIN_COSINE.
+        """
+        if key is None:
+            return None
+        cache = self._sim_cache
+        hit = key if key in cache else None
+        if hit is None and key[0] == "emotion" and cache:
+            candidates = [k for k in cache if k[0] == "emotion" and k[2:] == key[2:]]
+            if candidates:
+                keys = np.frombuffer(b"".join(k[1] for k in candidates), np.int8)
+                keys = keys.reshape(len(candidates), len(EMOTION_AXES)).astype(np.float32)
+                query = np.frombuffer(key[1], np.int8).astype(np.float32)
+                norms = np.linalg.norm(keys, axis=1) * np.linalg.norm(query)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    cosines = np.where(norms > 0, (keys @ query) / norms, 0.0)
+                best = int(np.argmax(cosines))
+                if cosines[best] >= _QUERY_CACHE_MIN_COSINE:
+                    hit = candidates[best]
+        if hit is None:
+            return None
+        cache.move_to_end(hit)
+        return list(cache[hit])
+
+    def _cache_store(self, key: Optional[tuple], episodes: list):
+        if key is None:
+            return
+        cache = self._sim_cache
+        cache[key] = list(episodes)
+        cache.move_to_end(key)
+        while len(cache) > _QUERY_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _find_episodes_by_ids(self, episode_ids: List[str]):
+        """Fetch episodes by ID (indexed $in lookup), in the given order"""
+        try:
+            cursor = self.msp.mongo_bridge.db.episodes.find({"episode_id": {"$in": episode_ids}}, {"_id": 0})
+            by_id = {ep.get("episode_id"): ep for ep in cursor}
+        except Exception as e:
+            logger.warning("[EpisodicMemory] Mongo query failed: %s", e)
+            return []
+        return [by_id[episode_id] for episode_id in episode_ids if episode_id in by_id]
+
+    def _find_episodes(self, query: Dict[str, Any], limit: int):
+        """Newest-first find() against the episodes collection"""
+        try:
+            cursor = self.msp.mongo_bridge.db.episodes.find(query, {"_id": 0})
+            return list(cursor.sort("timestamp", -1).limit(limit))
+        except Exception as e:
+            logger.warning("[EpisodicMemory] Mongo query failed: %s", e)
+            return []
+
+    @staticmethod
+    def _ci_contains(value: str) -> Dict[str, Any]:
+        return {"$regex": re.escape(value), "$options": "i"}
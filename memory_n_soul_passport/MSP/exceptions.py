@@ -2,23 +2,40 @@ from typing import Optional, Dict, Any
 
 class MSPError(Exception):
     """Base class for MSP-related errors"""
+    __slots__ = ("message", "_context")
+
     def __init__(self, message: str, context: Optional[Dict[str, Any]] = None):
         self.message = message
-        self.context = context or {}
+        self._context = context or None
         super().__init__(self.message)
 
+    @property
+    def context(self) -> Dict[str, Any]:
+        # The empty dict is only allocated if someone actually looks at it
+        if self._context is None:
+            self._context = {}
+        return self._context
+
+    @context.setter
+    def context(self, value: Optional[Dict[str, Any]]):
+        self._context = value
+
+    def __reduce__(self):
+        # Slots are not part of the default exception pickle state
+        return (type(self), (self.message, self._context))
+
 class MSPValidationError(MSPError):
     """Raised when data validation fails against schema"""
-    pass
+    __slots__ = ()
 
 class StructuralValidationError(MSPValidationError):
     """Raised when JSON structure is invalid"""
-    pass
+    __slots__ = ()
 
 class MSPConsolidationError(MSPError):
     """Raised when consolidation fails"""
-    pass
+    __slots__ = ()
 
 class MSPBackupError(MSPError):
     """Raised when backup fails"""
-    pass
+    __slots__ = ()
@@ -1,13 +1,123 @@
+import os
+import sys
+import json
+import time
 import uuid
+import atexit
+import logging
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, BinaryIO
 from datetime import datetime
 
-from .utils import now_iso
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .utils import now_iso, save_json, load_json, dumps_line, loads
 from .episodic import EpisodicMemory
 from .semantic import SemanticMemory
 from .sensory import SensoryMemory
 
+logger = logging.getLogger(__name__)
+
+# Max raw episode files kept by _load_episode
+_EPISODE_CACHE_SIZE = 512
+# Index size from which query_by_salience scores with NumPy (when installed)
+_NUMPY_SCAN_MIN = 256
+
+# Below this many uncached episodes, _load_episodes_bulk reads serially
+_BULK_LOAD_MIN = 4
+
+# Minimum seconds between rewrites of the streaming dashboard files
+_DASHBOARD_PERSIST_INTERVAL = 1.0
+
+# Maximum seconds buffered JSONL appends may sit in memory before a flush
+_WRITER_FLUSH_INTERVAL = 1.0
+
+# Remote mode: queued episode texts per batched embedding call
+_EMBED_BATCH_SIZE = 16
+
+# Index fields mirrored as pre-lowered "<field>_lc" copies for case-insensitive queries
+_LC_FIELDS = ("emotion_label", "event_label", "episode_tag", "salience_anchor",
+              "summary_user", "summary_eva")
+
+
+def _add_lc_fields(meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach lowercase copies of the searchable index fields (in place)"""
+    for field in _LC_FIELDS:
+        value = meta.get(field) or ""
+        # Hand-edited / legacy index lines may carry numbers or lists here
+        meta[field + "_lc"] = (value if isinstance(value, str) else str(value)).lower()
+    tags = meta.get("tags") or []
+    if not isinstance(tags, (list, tuple)):
+        tags = [tags]
+    meta["tags_lc"] = [(t if isinstance(t, str) else str(t)).lower() for t in tags]
+    return meta
+
+
+class _MetricRing:
+    """
+    Single-producer ring of (timestamp, value) samples for one physiological
+    dashboard stream. Storage is a power-of-two array indexed by a monotonically
+    increasing head counter, so an append is two slot stores and one increment
+    (no locks, no allocation). Readers capture head once and copy the last
+    `capacity` samples with at most two slices.
+    """
+    __slots__ = ("capacity", "last_update", "_mask", "_ts", "_values", "_head")
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.last_update: Optional[str] = None
+        slots = 1 << (self.capacity - 1).bit_length()
+        self._mask = slots - 1
+        if NUMPY_AVAILABLE:
+            self._ts = np.zeros(slots, dtype=np.float64)
+            self._values = np.zeros(slots, dtype=np.float64)
+        else:
+            self._ts = [0.0] * slots
+            self._values = [0.0] * slots
+        self._head = 0  # total samples ever appended
+
+    def append(self, timestamp: float, value: float):
+        i = self._head & self._mask
+        self._ts[i] = timestamp
+        self._values[i] = float(value)
+        self._head += 1
+
+    def _ordered(self, buf, head: int) -> list:
+        n = min(head, self.capacity)
+        start = (head - n) & self._mask
+        if start + n <= len(buf):
+            part = buf[start:start + n]
+        elif NUMPY_AVAILABLE:
+            part = np.concatenate((buf[start:], buf[:head & self._mask]))
+        else:
+            part = buf[start:] + buf[:head & self._mask]
+        return part.tolist() if NUMPY_AVAILABLE else part
+
+    def series(self):
+        """Oldest-first (timestamps, values) lists"""
+        head = self._head
+        return self._ordered(self._ts, head), self._ordered(self._values, head)
+
+    def summary(self):
+        """(timestamps, values, count, latest) read against a single head capture"""
+        head = self._head
+        latest = float(self._values[(head - 1) & self._mask]) if head else None
+        return (self._ordered(self._ts, head), self._ordered(self._values, head),
+                min(head, self.capacity), latest)
+
+    def entries(self) -> List[Dict[str, float]]:
+        """Oldest-first [{timestamp, value}] in the dashboard file layout"""
+        timestamps, values = self.series()
+        return [{"timestamp": t, "value": v} for t, v in zip(timestamps, values)]
+
+
 class MSP:
     """
     Memory & Soul Passport (Simplified for Testing)
@@ -18,7 +128,6 @@ class MSP:
             base_path = Path(__file__).parent.parent.parent
             
         # Ensure base_path is in path for Orchestrator imports
-        import sys
         base_str = str(base_path)
         if base_str not in sys.path:
             sys.path.append(base_str)
@@ -57,9 +166,66 @@ class MSP:
         self.episodes_path = self.episodic_dir / "episodes"
         self.episodic_index_path = self.episodic_dir / "episodic_index.jsonl"
         self.context_ledger_path = self.episodic_dir / "context_ledger.jsonl"
+        self.semantic_dir = self.consciousness_path / "02_Semantic_memory"
+        self.sensory_dir = self.consciousness_path / "03_Sensory_memory"
+        self.session_dir = self.consciousness_path / "04_Session_Memory"
+        self.core_memory_dir = self.consciousness_path / "06_Core_memory"
+        self.sphere_memory_dir = self.consciousness_path / "07_Sphere_memory"
+        self.user_block_dir = self.consciousness_path / "08_User_block"
+        self.state_dir = self.consciousness_path / "09_state"
+        self.dashboard_stream_dir = self.state_dir / "dashboard_stream"
+        self.context_storage_dir = self.consciousness_path / "10_context_storage"
+        self.semantic_log_path = self.semantic_dir / "semantic_log.jsonl"
+        self.sensory_log_path = self.sensory_dir / "sensory_log.jsonl"
+        self.session_log_path = self.session_dir / "session_log.jsonl"
+        self.state_history_path = self.state_dir / "consciousness_history.jsonl"
+        self.context_log_path = self.context_storage_dir / "context_log.jsonl"
+
+        # In-memory mirror of episodic_index.jsonl, grown by tail reads
+        self._index_cache: List[Dict[str, Any]] = []
+        self._index_offset: int = 0
+        # Secondary indexes: lowercase key -> positions in _index_cache
+        self._by_emotion_label: Dict[str, List[int]] = {}
+        self._by_event_label: Dict[str, List[int]] = {}
+        self._by_episode_tag: Dict[str, List[int]] = {}
+        self._by_tag: Dict[str, List[int]] = {}
+        # emotion_label per cached entry, in index order (for sequence matching)
+        self._emotion_label_seq: List[Optional[str]] = []
+        # Salience scan columns, in index order
+        self._resonance_col = array("d")
+        self._salience_anchor_col: List[str] = []
+
+        # In-memory mirror of context_ledger.jsonl: (summary_lc, entry) in file order,
+        # plus the latest entry per context_id
+        self._ledger_cache: List[tuple] = []
+        self._ledger_by_context: Dict[str, Dict[str, Any]] = {}
+        self._ledger_offset: int = 0
+
+        # Raw episode files: episode_id -> (mtime_ns, bytes), LRU ordered
+        self._episode_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+        # (episode_id, text) pairs waiting for a batched embedding call (remote mode)
+        self._embed_queue: List[tuple] = []
+
+        # In-memory rings for physiological dashboard streams (metric_name -> _MetricRing);
+        # their JSON files are rewritten at most every _DASHBOARD_PERSIST_INTERVAL seconds
+        self._dashboard_rings: Dict[str, _MetricRing] = {}
+        self._dashboard_dirty: set = set()
+        self._dashboard_persisted_at: float = 0.0
+
+        # Long-lived buffered append handles for the JSONL logs; flushed at most
+        # every _WRITER_FLUSH_INTERVAL seconds by _append (and on end_session/exit)
+        self._writers: Dict[Path, BinaryIO] = {}
+        self._writers_flushed_at: float = time.monotonic()
+        atexit.register(self.flush_writers)
 
         if use_local:
-            self.episodes_path.mkdir(parents=True, exist_ok=True)
+            # Create the storage tree once so the write paths never stat/mkdir
+            for directory in (self.episodes_path, self.semantic_dir, self.sensory_dir,
+                              self.session_dir, self.core_memory_dir, self.sphere_memory_dir,
+                              self.user_block_dir, self.dashboard_stream_dir,
+                              self.context_storage_dir):
+                directory.mkdir(parents=True, exist_ok=True)
 
         print(f"[MSP] Initialized ({'LOCAL' if use_local else 'REMOTE'} Mode)")
         if not use_local:
@@ -67,6 +233,8 @@ class MSP:
                 print("[MSP] MongoDB Integration: ACTIVE")
             if self.neo4j_bridge and self.neo4j_bridge.driver:
                 print("[MSP] Neo4j Integration: ACTIVE")
+            # Let the databases filter by label/tag/event instead of scanning
+            self.episodic.ensure_indexes()
         else:
             print(f"[MSP] Local consciousness path: {self.consciousness_path}")
 
@@ -76,64 +244,40 @@ class MSP:
 
     def write_episode(self, episode_data: Dict[str, Any], ri_level: str = "L3") -> str:
         """Write episode to local file or database"""
-        import json
-        
-        # Generate ID if not present
-        if "episode_id" not in episode_data:
-            episode_data["episode_id"] = f"ep_{uuid.uuid4().hex[:12]}"
-        
-        episode_id = episode_data["episode_id"]
-        timestamp = episode_data.get("timestamp", now_iso())
-        episode_data["timestamp"] = timestamp
-        episode_data["session_id"] = self.session_id or "default"
         
-        # Prepare text for embedding
-        user_sum = episode_data.get("turn_1", {}).get("summary", "")
-        eva_sum = episode_data.get("turn_2", {}).get("summary", "")
-        full_text = f"User: {user_sum}\nEVA: {eva_sum}"
+        episode_id = self._stamp_episode(episode_data)
         
         # LOCAL MODE PERSISTENCE
         if self.use_local:
             # 1. Save Full Episode to Individual File
-            file_path = self.episodes_path / f"{episode_id}.json"
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(episode_data, f, ensure_ascii=False, indent=2)
+            self._episode_cache.pop(episode_id, None)
+            self._save_episode_file(episode_data)
                 
             # 2. Update Metadata Index (L0 Search Index)
             # Separate User and LLM summaries for indexing
-            metadata = {
-                "episode_id": episode_id,
-                "timestamp": timestamp,
-                "session_id": self.session_id or "default",
-                "ri_level": ri_level,
-                "resonance_index": episode_data.get("state_snapshot", {}).get("Resonance_index", 0.5),
-                "emotion_label": episode_data.get("state_snapshot", {}).get("EVA_matrix", {}).get("emotion_label", "Neutral"),
-                "context_id": episode_data.get("situation_context", {}).get("context_id", ""), 
-                "episode_tag": episode_data.get("episode_tag", ""), # Episode Name
-                "event_label": episode_data.get("event_label", ""), # Narrative Event
-                "tags": episode_data.get("turn_1", {}).get("semantic_frames", []),
-                "summary_user": user_sum,
-                "summary_eva": eva_sum,
-                "salience_anchor": episode_data.get("turn_1", {}).get("salience_anchor", {}).get("phrase", "")
-            }
-            
-            with open(self.episodic_index_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(metadata, ensure_ascii=False) + "\n")
+            metadata = self._index_metadata(episode_data, ri_level)
+            self._append(self.episodic_index_path, dumps_line(metadata))
                 
             print(f"[MSP] [OK] Episode {episode_id} Indexed and Saved.")
             self.episode_count += 1
             return episode_id
 
         # REMOTE MODE (Bridges)
-        # Generate embedding
-        embedding = None
+        timestamp = episode_data["timestamp"]
+        # Prepare text for embedding
+        user_sum = episode_data.get("turn_1", {}).get("summary", "")
+        eva_sum = episode_data.get("turn_2", {}).get("summary", "")
+        full_text = f"User: {user_sum}\nEVA: {eva_sum}"
+        
+        # Embeddings are computed in batches and patched in afterwards
         if self.vector_bridge and full_text.strip():
-            embedding = self.vector_bridge.get_embedding(full_text)
+            self._embed_queue.append((episode_id, full_text))
         
-        # 1. Write to MongoDB (Full Document)
+        # 1. Write to MongoDB (Full Document, embedding pending)
         if self.mongo_bridge:
-            success = self.mongo_bridge.insert_episode(episode_data, embedding)
+            success = self.mongo_bridge.insert_episode(episode_data, None)
             if success:
+                self.episodic.invalidate_query_cache()
                 print(f"[MSP] [OK] Episode {episode_id} -> MongoDB")
             else:
                 print(f"[MSP] [FAILED] MongoDB write failed for {episode_id}")
@@ -145,18 +289,116 @@ class MSP:
             except Exception as e:
                 print(f"[MSP] [FAILED] Neo4j Episode Node creation failed: {e}")
 
+        if len(self._embed_queue) >= _EMBED_BATCH_SIZE:
+            self.flush_embeddings()
+
         self.episode_count += 1
         return episode_id
 
+    def flush_embeddings(self) -> int:
+        """
+        Embed all queued episode texts in one vector-bridge call and patch the
+        vectors into MongoDB. Returns the number of episodes updated.
+        """
+        if not self._embed_queue or not self.vector_bridge:
+            self._embed_queue.clear()
+            return 0
+        pending, self._embed_queue = self._embed_queue, []
+        texts = [text for _, text in pending]
+        try:
+            if hasattr(self.vector_bridge, 'get_embeddings_batch'):
+                vectors = self.vector_bridge.get_embeddings_batch(texts)
+            else:
+                vectors = [self.vector_bridge.get_embedding(text) for text in texts]
+        except Exception as e:
+            print(f"[MSP] [FAILED] Batch embedding failed ({len(texts)} episodes): {e}")
+            return 0
+
+        if not self.mongo_bridge:
+            return 0
+        updates = [(episode_id, vec) for (episode_id, _), vec in zip(pending, vectors) if vec is not None]
+        try:
+            if hasattr(self.mongo_bridge, 'update_episode_embeddings'):
+                self.mongo_bridge.update_episode_embeddings(updates)
+            else:
+                for episode_id, vec in updates:
+                    self.mongo_bridge.db.episodes.update_one(
+                        {"episode_id": episode_id}, {"$set": {"embedding": vec}})
+        except Exception as e:
+            print(f"[MSP] [FAILED] Embedding update failed: {e}")
+            return 0
+        print(f"[MSP] [OK] {len(updates)} Episode embeddings -> MongoDB")
+        return len(updates)
+
+    def write_episodes(self, episodes: List[Dict[str, Any]], ri_level: str = "L3") -> List[str]:
+        """
+        Batch version of write_episode.
+        Local mode writes the episode files on a small thread pool and appends
+        all index lines with a single write. Remote mode falls back to write_episode.
+        """
+        if not episodes:
+            return []
+        if not self.use_local:
+            return [self.write_episode(ep, ri_level) for ep in episodes]
+
+        episode_ids = [self._stamp_episode(ep) for ep in episodes]
+        for episode_id in episode_ids:
+            self._episode_cache.pop(episode_id, None)
+
+        if len(episodes) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(episodes))) as pool:
+                list(pool.map(self._save_episode_file, episodes))
+        else:
+            self._save_episode_file(episodes[0])
+
+        blob = b"".join(dumps_line(self._index_metadata(ep, ri_level)) for ep in episodes)
+        self._append(self.episodic_index_path, blob)
+
+        print(f"[MSP] [OK] {len(episode_ids)} Episodes Indexed and Saved.")
+        self.episode_count += len(episode_ids)
+        return episode_ids
+
+    def _stamp_episode(self, episode_data: Dict[str, Any]) -> str:
+        """Fill in episode_id / timestamp / session_id and return the ID"""
+        # Generate ID if not present
+        if "episode_id" not in episode_data:
+            episode_data["episode_id"] = f"ep_{uuid.uuid4().hex[:12]}"
+        episode_data["timestamp"] = episode_data.get("timestamp", now_iso())
+        episode_data["session_id"] = self.session_id or "default"
+        return episode_data["episode_id"]
+
+    def _save_episode_file(self, episode_data: Dict[str, Any]) -> None:
+        file_path = self.episodes_path / f"{episode_data['episode_id']}.json"
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(episode_data, f, ensure_ascii=False, indent=2)
+
+    def _index_metadata(self, episode_data: Dict[str, Any], ri_level: str) -> Dict[str, Any]:
+        """Build the L0 index entry for an episode (User and LLM summaries kept separate)"""
+        turn_1 = episode_data.get("turn_1", {})
+        state_snapshot = episode_data.get("state_snapshot", {})
+        metadata = {
+            "episode_id": episode_data["episode_id"],
+            "timestamp": episode_data["timestamp"],
+            "session_id": self.session_id or "default",
+            "ri_level": ri_level,
+            "resonance_index": state_snapshot.get("Resonance_index", 0.5),
+            "emotion_label": state_snapshot.get("EVA_matrix", {}).get("emotion_label", "Neutral"),
+            "context_id": episode_data.get("situation_context", {}).get("context_id", ""), 
+            "episode_tag": episode_data.get("episode_tag", ""), # Episode Name
+            "event_label": episode_data.get("event_label", ""), # Narrative Event
+            "tags": turn_1.get("semantic_frames", []),
+            "summary_user": turn_1.get("summary", ""),
+            "summary_eva": episode_data.get("turn_2", {}).get("summary", ""),
+            "salience_anchor": turn_1.get("salience_anchor", {}).get("phrase", "")
+        }
+        return _add_lc_fields(metadata)
+
     def write_semantic(self, concept: str, definition: str, episode_id: str, 
                       category: str = "Semantic", relation: str = "REFERENCED_IN") -> str:
         """Write semantic concept to local file or Neo4j"""
-        import json
         semantic_id = f"sem_{uuid.uuid4().hex[:8]}"
         
         if self.use_local:
-            log_path = self.base_path / "consciousness" / "02_Semantic_memory" / "semantic_log.jsonl"
-            log_path.parent.mkdir(parents=True, exist_ok=True)
             entry = {
                 "semantic_id": semantic_id,
                 "concept": concept,
@@ -166,8 +408,7 @@ class MSP:
                 "relation": relation,
                 "timestamp": now_iso()
             }
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._append(self.semantic_log_path, dumps_line(entry))
             print(f"[MSP] [OK] Concept '{concept}' -> Local JSONL")
             return semantic_id
 
@@ -189,7 +430,6 @@ class MSP:
                      capture_channel: str, raw_content, feature_snapshot: Optional[Dict] = None,
                      capture_quality: str = "medium") -> str:
         """Write sensory data to local file or MongoDB"""
-        import json
         sensory_id = f"sen_{uuid.uuid4().hex[:8]}"
         
         sensory_data = {
@@ -205,10 +445,7 @@ class MSP:
         }
         
         if self.use_local:
-            log_path = self.base_path / "consciousness" / "03_Sensory_memory" / "sensory_log.jsonl"
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(sensory_data, ensure_ascii=False) + "\n")
+            self._append(self.sensory_log_path, dumps_line(sensory_data))
             print(f"[MSP] [OK] Sensory {sensory_id} -> Local JSONL")
             return sensory_id
 
@@ -223,29 +460,28 @@ class MSP:
 
     def write_state(self, episode_id: str, state_snapshot: Dict[str, Any]) -> bool:
         """Write consciousness state snapshot to local files or MongoDB"""
-        from .utils import save_json
         
         if self.use_local:
             # We save the full snapshot to a session-based file in state history
             # But we also update the individual state files for quick turn load
-            state_dir = self.base_path / "consciousness" / "09_state"
+            state_dir = self.state_dir
             
-            # 1. Update individual "live" files
-            for key, val in state_snapshot.items():
-                if isinstance(val, dict):
-                    file_path = state_dir / f"{key}_state.json"
-                    save_json(file_path, val)
+            # 1. Update individual "live" files (independent files, written concurrently)
+            updates = [(state_dir / f"{key}_state.json", val)
+                       for key, val in state_snapshot.items() if isinstance(val, dict)]
+            if len(updates) > 1:
+                with ThreadPoolExecutor(max_workers=min(4, len(updates))) as pool:
+                    list(pool.map(lambda item: save_json(*item), updates))
+            elif updates:
+                save_json(*updates[0])
             
             # 2. Log complete snapshot for this episode
-            log_path = state_dir / "consciousness_history.jsonl"
-            import json
             entry = {
                 "episode_id": episode_id,
                 "timestamp": now_iso(),
                 "snapshot": state_snapshot
             }
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._append(self.state_history_path, dumps_line(entry))
             
             print(f"[MSP] [OK] State Snapshot -> Local Files")
             return True
@@ -266,9 +502,8 @@ class MSP:
     def write_user_block(self, block_data: Dict[str, Any]) -> bool:
         """Write user profile block locally or to DB"""
         if self.use_local:
-            from .utils import save_json
             block_id = block_data.get("block_id", "unknown_user")
-            path = self.base_path / "consciousness" / "08_User_block" / f"{block_id}.json"
+            path = self.user_block_dir / f"{block_id}.json"
             save_json(path, block_data)
             print(f"[MSP] [OK] User Block '{block_id}' Saved Locally")
             return True
@@ -285,7 +520,6 @@ class MSP:
 
     def write_context(self, context_id: str, episode_id: str, step1_data: Dict[str, Any], step2_data: Dict[str, Any]) -> bool:
         """Write aggregated LLM context payloads to local storage or MongoDB"""
-        import json
         
         context_entry = {
             "context_id": context_id,
@@ -297,10 +531,7 @@ class MSP:
         }
         
         if self.use_local:
-            log_path = self.base_path / "consciousness" / "10_context_storage" / "context_log.jsonl"
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(context_entry, ensure_ascii=False) + "\n")
+            self._append(self.context_log_path, dumps_line(context_entry))
             print(f"[MSP] [OK] Context {context_id} -> Local JSONL")
             return True
 
@@ -317,10 +548,9 @@ class MSP:
     def write_core_memory(self, core_data: Dict[str, Any]) -> bool:
         """Write foundational belief/identity data to Core Memory"""
         if self.use_local:
-            from .utils import save_json
             # Use core_id or a unique field as filename
             core_id = core_data.get("core_id", f"core_{uuid.uuid4().hex[:8]}")
-            path = self.base_path / "consciousness" / "06_Core_memory" / f"{core_id}.json"
+            path = self.core_memory_dir / f"{core_id}.json"
             save_json(path, core_data)
             print(f"[MSP] [OK] Core Memory '{core_id}' Saved Locally")
             return True
@@ -329,9 +559,8 @@ class MSP:
     def write_sphere_memory(self, sphere_data: Dict[str, Any]) -> bool:
         """Write conceptual domain data to Sphere Memory"""
         if self.use_local:
-            from .utils import save_json
             sphere_id = sphere_data.get("sphere_id", f"sphere_{uuid.uuid4().hex[:8]}")
-            path = self.base_path / "consciousness" / "07_Sphere_memory" / f"{sphere_id}.json"
+            path = self.sphere_memory_dir / f"{sphere_id}.json"
             save_json(path, sphere_data)
             print(f"[MSP] [OK] Sphere Memory '{sphere_id}' Saved Locally")
             return True
@@ -366,10 +595,8 @@ class MSP:
             bool: Success/failure of state registration
         """
         if self.use_local:
-            from .utils import save_json, load_json
-            import json
             
-            state_dir = self.base_path / "consciousness" / "09_state"
+            state_dir = self.state_dir
             timestamp = now_iso()
             
             # Wrap state in standardized envelope
@@ -409,8 +636,8 @@ class MSP:
                 
                 # TIER 3: Full History Log (archival)
                 history_file = state_dir / f"{module_name}_state_history.jsonl"
-                with open(history_file, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(state_envelope, ensure_ascii=False) + "\n")
+                with open(history_file, "ab") as f:
+                    f.write(dumps_line(state_envelope))
                 
                 print(f"[MSP] [STATE REGISTRY] {module_name} → Current/Buffer/History")
                 return True
@@ -431,8 +658,7 @@ class MSP:
             dict: Module state envelope or None if not found
         """
         if self.use_local:
-            from .utils import load_json
-            state_file = self.base_path / "consciousness" / "09_state" / f"{module_name}_state.json"
+            state_file = self.state_dir / f"{module_name}_state.json"
             return load_json(state_file)
         return None
 
@@ -445,9 +671,8 @@ class MSP:
         """
         all_states = {}
         if self.use_local:
-            state_dir = self.base_path / "consciousness" / "09_state"
+            state_dir = self.state_dir
             if state_dir.exists():
-                from .utils import load_json
                 for state_file in state_dir.glob("*_state.json"):
                     module_name = state_file.stem.replace("_state", "")
                     state_data = load_json(state_file)
@@ -467,8 +692,7 @@ class MSP:
             list: Recent state entries (oldest first)
         """
         if self.use_local:
-            from .utils import load_json
-            buffer_file = self.base_path / "consciousness" / "09_state" / f"{module_name}_state_buffer.json"
+            buffer_file = self.state_dir / f"{module_name}_state_buffer.json"
             buffer_data = load_json(buffer_file)
             
             if buffer_data and "entries" in buffer_data:
@@ -490,7 +714,8 @@ class MSP:
             dict: {
                 "timestamp": "...",
                 "modules": {...},  # Regular state modules
-                "streaming_metrics": {...}  # Dashboard streaming data (if enabled)
+                "streaming_metrics": {...}  # Dashboard streaming data (if enabled);
+                                            # each metric carries count/latest plus the series
             }
         """
         dashboard_data = {
@@ -500,11 +725,10 @@ class MSP:
         }
         
         if self.use_local:
-            state_dir = self.base_path / "consciousness" / "09_state"
+            state_dir = self.state_dir
             
             # Get all current states (existing logic)
             if state_dir.exists():
-                from .utils import load_json
                 
                 for state_file in state_dir.glob("*_state.json"):
                     module_name = state_file.stem.replace("_state", "")
@@ -525,22 +749,38 @@ class MSP:
             
             # Get streaming metrics (NEW)
             if include_streaming:
-                dashboard_stream_dir = state_dir / "dashboard_stream"
+                dashboard_stream_dir = self.dashboard_stream_dir
                 if dashboard_stream_dir.exists():
-                    from .utils import load_json
                     
                     for stream_file in dashboard_stream_dir.glob("*_dashboard.json"):
                         metric_name = stream_file.stem.replace("_dashboard", "")
+                        if metric_name in self._dashboard_rings:
+                            continue  # live ring below is newer than its file
                         metric_data = load_json(stream_file)
                         
                         if metric_data:
+                            entries = metric_data["buffer"]["entries"]
                             dashboard_data["streaming_metrics"][metric_name] = {
                                 "category": metric_data.get("category"),
-                                "values": [e["value"] for e in metric_data["buffer"]["entries"]],
-                                "timestamps": [e["timestamp"] for e in metric_data["buffer"]["entries"]],
+                                "count": len(entries),
+                                "latest": entries[-1]["value"] if entries else None,
+                                "values": [e["value"] for e in entries],
+                                "timestamps": [e["timestamp"] for e in entries],
                                 "buffer_size": metric_data["buffer"]["size"],
                                 "last_update": metric_data["metadata"]["last_update"]
                             }
+                
+                for metric_name, ring in self._dashboard_rings.items():
+                    timestamps, values, count, latest = ring.summary()
+                    dashboard_data["streaming_metrics"][metric_name] = {
+                        "category": "physiological_stream",
+                        "count": count,
+                        "latest": latest,
+                        "values": values,
+                        "timestamps": timestamps,
+                        "buffer_size": ring.capacity,
+                        "last_update": ring.last_update
+                    }
         
         return dashboard_data
 
@@ -565,17 +805,14 @@ class MSP:
         if not self.use_local:
             return False
         
-        from .utils import load_json, save_json
-        import time
+        if category == "physiological_stream":
+            return self.register_dashboard_metrics_batch({metric_name: value}, category, buffer_size)
         
         # Determine buffer size based on category
         if buffer_size is None:
-            buffer_size = 900 if category == "physiological_stream" else 20
+            buffer_size = 20
         
-        dashboard_dir = self.base_path / "consciousness" / "09_state" / "dashboard_stream"
-        dashboard_dir.mkdir(exist_ok=True)
-        
-        metric_file = dashboard_dir / f"{metric_name}_dashboard.json"
+        metric_file = self.dashboard_stream_dir / f"{metric_name}_dashboard.json"
         
         try:
             # Load existing buffer or create new
@@ -623,6 +860,90 @@ class MSP:
             print(f"[MSP] [ERROR] Failed to register dashboard metric {metric_name}: {e}")
             return False
 
+    def register_dashboard_metrics_batch(self, metrics: Dict[str, Any],
+                                         category: str = "physiological_stream",
+                                         buffer_size: Optional[int] = None) -> bool:
+        """
+        Register one frame of dashboard metrics ({metric_name: value}) in a single call.
+        
+        Physiological streams are kept in fixed-capacity in-memory rings (seeded
+        from the existing dashboard file on first use), so a sample costs one
+        slot store instead of a load/rotate of the whole JSON buffer.
+        get_dashboard_snapshot reads the rings directly; the metric files are
+        rewritten at most once per _DASHBOARD_PERSIST_INTERVAL (and on flush).
+        
+        Returns:
+            bool: Success/failure
+        """
+        if not self.use_local:
+            return False
+        if category != "physiological_stream":
+            return all([self.register_dashboard_metric(name, value, category, buffer_size)
+                        for name, value in metrics.items()])
+        
+        if buffer_size is None:
+            buffer_size = 900
+        now = time.time()
+        last_update = now_iso()
+        
+        try:
+            for metric_name, value in metrics.items():
+                ring = self._dashboard_ring(metric_name, buffer_size)
+                ring.append(now, value)
+                ring.last_update = last_update
+                self._dashboard_dirty.add(metric_name)
+        except (TypeError, ValueError) as e:
+            print(f"[MSP] [ERROR] Failed to register dashboard metrics {list(metrics)}: {e}")
+            return False
+        
+        if now - self._dashboard_persisted_at >= _DASHBOARD_PERSIST_INTERVAL:
+            self.flush_dashboard_metrics()
+        return True
+
+    def flush_dashboard_metrics(self) -> bool:
+        """Write the JSON files of streaming metrics that changed since the last flush"""
+        ok = True
+        for metric_name in list(self._dashboard_dirty):
+            ring = self._dashboard_rings[metric_name]
+            try:
+                save_json(self.dashboard_stream_dir / f"{metric_name}_dashboard.json", {
+                    "metric_name": metric_name,
+                    "category": "physiological_stream",
+                    "buffer": {
+                        "size": ring.capacity,
+                        "circular": True,
+                        "entries": ring.entries()
+                    },
+                    "metadata": {
+                        "update_frequency": "30 Hz",
+                        "last_update": ring.last_update
+                    }
+                })
+            except (OSError, TypeError) as e:
+                print(f"[MSP] [ERROR] Failed to persist dashboard metric {metric_name}: {e}")
+                ok = False
+        self._dashboard_dirty.clear()
+        self._dashboard_persisted_at = time.time()
+        return ok
+
+    def _dashboard_ring(self, metric_name: str, buffer_size: int) -> _MetricRing:
+        """Get (or create and seed from disk) the stream ring for a metric"""
+        ring = self._dashboard_rings.get(metric_name)
+        if ring is not None and ring.capacity == max(1, buffer_size):
+            return ring
+        
+        new_ring = _MetricRing(buffer_size)
+        if ring is not None:
+            old_entries = ring.entries()
+        else:
+            stored = load_json(self.dashboard_stream_dir / f"{metric_name}_dashboard.json")
+            old_entries = stored.get("buffer", {}).get("entries", []) if stored else []
+        for entry in old_entries[-new_ring.capacity:]:
+            if isinstance(entry.get("value"), (int, float)):
+                new_ring.append(entry.get("timestamp", 0.0), entry["value"])
+        self._dashboard_rings[metric_name] = new_ring
+        return new_ring
+
     # =========================================================================
     # SESSION LIFECYCLE (Simplified)
     # =========================================================================
@@ -636,17 +957,15 @@ class MSP:
         self.episode_count = 0
         
         if self.use_local:
-            import json
-            log_path = self.base_path / "consciousness" / "04_Session_Memory" / "session_log.jsonl"
-            log_path.parent.mkdir(parents=True, exist_ok=True)
+            log_path = self.session_log_path
             entry = {
                 "event": "session_start",
                 "session_id": session_id,
                 "timestamp": now_iso()
             }
             try:
-                with open(log_path, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                with open(log_path, "ab") as f:
+                    f.write(dumps_line(entry))
             except Exception as e:
                 print(f"[MSP] Error logging session start: {e}")
 
@@ -661,9 +980,11 @@ class MSP:
             "status": "ended"
         }
         
+        self.flush_writers()
+        self.flush_embeddings()
+
         if self.use_local and self.session_id:
-            import json
-            log_path = self.base_path / "consciousness" / "04_Session_Memory" / "session_log.jsonl"
+            log_path = self.session_log_path
             try:
                 entry = {
                     "event": "session_end",
@@ -671,9 +992,10 @@ class MSP:
                     "timestamp": now_iso(),
                     "stats": result
                 }
-                with open(log_path, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
-            except: pass
+                with open(log_path, "ab") as f:
+                    f.write(dumps_line(entry))
+            except (OSError, TypeError) as e:
+                print(f"[MSP] Error logging session end: {e}")
 
         print(f"[MSP] Session ended: {self.session_id} ({self.episode_count} episodes)")
         self.session_id = None
@@ -687,16 +1009,14 @@ class MSP:
     def get_state(self, key: str) -> Optional[Dict[str, Any]]:
         """Get state from local files if in local mode"""
         if self.use_local:
-            from .utils import load_json
-            path = self.base_path / "consciousness" / "09_state" / f"{key}_state.json"
+            path = self.state_dir / f"{key}_state.json"
             return load_json(path)
         return None
 
     def set_state(self, key: str, value: Dict[str, Any]):
         """Set state to local files if in local mode"""
         if self.use_local:
-            from .utils import save_json
-            path = self.base_path / "consciousness" / "09_state" / f"{key}_state.json"
+            path = self.state_dir / f"{key}_state.json"
             save_json(path, value)
 
     # =========================================================================
@@ -706,131 +1026,112 @@ class MSP:
     def query_by_emotion_label(self, label: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Stream E: Quick search by emotional label"""
         if self.use_local:
-            if not self.episodic_index_path.exists(): return []
-            
-            results = []
-            import json
-            try:
-                with open(self.episodic_index_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        meta = json.loads(line.strip())
-                        if meta.get("emotion_label", "").lower() == label.lower():
-                            # Lazy load full data
-                            results.append(self._load_episode(meta["episode_id"]))
-                            if len(results) >= limit: break
-            except: pass
-            return results
-        return []
+            index = self._refresh_index()
+            positions = self._by_emotion_label.get(label.lower(), [])[:limit]
+            # Lazy load full data
+            return self._load_episodes_bulk([index[pos]["episode_id"] for pos in positions])
+        return self.episodic.query_by_emotion_label(label, limit)
 
     def query_by_emotion(self, emotion_vec: Dict[str, float], threshold: float = 0.6, limit: int = 5) -> List[Dict[str, Any]]:
         """Query episodes by emotion similarity (Indexed)"""
         if self.use_local:
-            if not self.episodic_index_path.exists(): return []
-            
-            results = []
-            import json
-            try:
-                with open(self.episodic_index_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        meta = json.loads(line.strip())
-                        # Note: Vector similarity should technically be in index if we want it fast
-                        # But label check is a good first pass or we load full file if threshold is low
-                        # For now, let's assume we might need to load full to check vector in detail
-                        # OR if we only store 'emotion_label' in index, we match on that.
-                        if meta.get("emotion_label") == emotion_vec.get("emotion_label"):
-                             results.append(self._load_episode(meta["episode_id"]))
-                        
-                        if len(results) >= limit: break
-            except: pass
-            return results
+            matched = []
+            index = self._refresh_index()
+            target = emotion_vec.get("emotion_label")
+            # Narrow to the label bucket; exact (case-sensitive) match is checked below
+            positions = self._by_emotion_label.get(target.lower(), []) if isinstance(target, str) else range(len(index))
+            for pos in positions:
+                meta = index[pos]
+                # Note: Vector similarity should technically be in index if we want it fast
+                # But label check is a good first pass or we load full file if threshold is low
+                # For now, let's assume we might need to load full to check vector in detail
+                # OR if we only store 'emotion_label' in index, we match on that.
+                if meta.get("emotion_label") == target:
+                    matched.append(meta["episode_id"])
+
+                if len(matched) >= limit: break
+            return self._load_episodes_bulk(matched)
 
         return self.episodic.query_by_emotion(emotion_vec, threshold, limit)
 
     def query_by_tags(self, tags: List[str], limit: int = 5) -> List[Dict[str, Any]]:
         """Query episodes by semantic tags (Indexed)"""
         if self.use_local:
-            if not self.episodic_index_path.exists(): return []
-            
-            results = []
-            import json
-            try:
-                with open(self.episodic_index_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        meta = json.loads(line.strip())
-                        ep_tags = meta.get("tags", [])
-                        if any(tag.lower() in [t.lower() for t in ep_tags] for tag in tags):
-                            results.append(self._load_episode(meta["episode_id"]))
-                            if len(results) >= limit: break
-            except: pass
-            return results
+            index = self._refresh_index()
+            query_tags = {tag.lower() for tag in tags}
+            # Union of the per-tag posting lists, in index (file) order
+            positions = sorted(set().union(*(self._by_tag.get(t, ()) for t in query_tags)))[:limit]
+            return self._load_episodes_bulk([index[pos]["episode_id"] for pos in positions])
 
         return self.episodic.query_by_tags(tags, limit)
 
     def query_by_salience(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Query episodes by salience (Indexed)"""
         if self.use_local:
-            if not self.episodic_index_path.exists(): return []
-            
+            query_lc = query.lower()
+            index = self._refresh_index()
+            if NUMPY_AVAILABLE and limit > 0 and len(index) >= _NUMPY_SCAN_MIN:
+                top = self._salience_top_numpy(query_lc, limit)
+                return self._load_episodes_bulk([index[pos]["episode_id"] for pos in top])
+
             candidates = []
-            import json
-            try:
-                with open(self.episodic_index_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                         meta = json.loads(line.strip())
-                         ri = meta.get("resonance_index", 0.0)
-                         anchor = meta.get("salience_anchor", "")
-                         
-                         score = ri
-                         if query.lower() in anchor.lower():
-                             score += 0.5
-                         
-                         if score > 0.6:
-                             candidates.append((score, meta["episode_id"]))
-                    
-                    candidates.sort(key=lambda x: x[0], reverse=True)
-                    return [self._load_episode(c[1]) for c in candidates[:limit]]
-            except: pass
-            return []
+            # Scan the resonance / anchor columns instead of the entry dicts
+            for pos, (ri, anchor_lc) in enumerate(zip(self._resonance_col, self._salience_anchor_col)):
+                score = ri + 0.5 if query_lc in anchor_lc else ri
+                if score > 0.6:
+                    candidates.append((score, pos))
+
+            candidates.sort(key=lambda x: x[0], reverse=True)
+            return self._load_episodes_bulk([index[c[1]]["episode_id"] for c in candidates[:limit]])
         return []
 
+    def _salience_top_numpy(self, query_lc: str, limit: int) -> List[int]:
+        """
+        Vectorized query_by_salience scoring: positions of the `limit` best
+        scores above 0.6, highest first, ties in index order (same as the
+        stable Python sort).
+        """
+        n = len(self._resonance_col)
+        # Copy so the array('d') is not left exporting its buffer (it must stay appendable)
+        scores = np.frombuffer(self._resonance_col, dtype=np.float64).copy()
+        if query_lc:
+            hits = np.fromiter((query_lc in a for a in self._salience_anchor_col), dtype=bool, count=n)
+            scores[hits] += 0.5
+        else:
+            scores += 0.5
+
+        cand = np.flatnonzero(scores > 0.6)
+        cand_scores = scores[cand]
+        if len(cand) > limit:
+            # O(N) selection of the top `limit`, keeping the earliest positions on ties
+            kth = np.partition(cand_scores, len(cand) - limit)[len(cand) - limit]
+            above = np.flatnonzero(cand_scores > kth)
+            ties = np.flatnonzero(cand_scores == kth)[:limit - len(above)]
+            keep = np.concatenate((above, ties))
+            cand, cand_scores = cand[keep], cand_scores[keep]
+        order = np.lexsort((cand, -cand_scores))
+        return cand[order].tolist()
+
     def query_by_event(self, event_label: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Query episodes belonging to a specific named event or narrative arc"""
         if self.use_local:
-            if not self.episodic_index_path.exists(): return []
-            results = []
-            import json
-            try:
-                with open(self.episodic_index_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        meta = json.loads(line.strip())
-                        if event_label.lower() in meta.get("event_label", "").lower():
-                            results.append(self._load_episode(meta["episode_id"]))
-                            if len(results) >= limit: break
-            except: pass
-            return results
-        return []
+            index = self._refresh_index()
+            positions = self._positions_matching(self._by_event_label, event_label.lower())[:limit]
+            return self._load_episodes_bulk([index[pos]["episode_id"] for pos in positions])
+        return self.episodic.query_by_event(event_label, limit)
 
     def query_by_episode_name(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Query episodes by their specific tag/name"""
         if self.use_local:
-            if not self.episodic_index_path.exists(): return []
-            results = []
-            import json
-            try:
-                with open(self.episodic_index_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        meta = json.loads(line.strip())
-                        if name.lower() in meta.get("episode_tag", "").lower():
-                            results.append(self._load_episode(meta["episode_id"]))
-                            if len(results) >= limit: break
-            except: pass
-            return results
-        return []
+            index = self._refresh_index()
+            positions = self._positions_matching(self._by_episode_tag, name.lower())[:limit]
+            return self._load_episodes_bulk([index[pos]["episode_id"] for pos in positions])
+        return self.episodic.query_by_episode_name(name, limit)
 
-    def write_context(self, context_id: str, summary: str, metadata: Dict = None) -> bool:
-        """Store a high-level summary of a completed task/context"""
+    def write_reflection(self, context_id: str, summary: str, metadata: Dict = None) -> bool:
+        """Store a high-level summary of a completed task/context in the context ledger
+        (read back by get_context / query_reflections)"""
         if self.use_local:
-            import json
             payload = {
                 "context_id": context_id,
                 "summary": summary,
@@ -838,60 +1139,43 @@ class MSP:
                 "metadata": metadata or {}
             }
             try:
-                with open(self.context_ledger_path, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+                self._append(self.context_ledger_path, dumps_line(payload))
                 return True
-            except: return False
+            except (OSError, TypeError) as e:
+                print(f"[MSP] Error writing reflection {context_id}: {e}")
+                return False
         return False
 
     def get_context(self, context_id: str) -> Optional[Dict]:
         """Retrieve the cached summary of a specific context (Latest entry)"""
         if self.use_local:
-            if not self.context_ledger_path.exists(): return None
-            import json
-            latest = None
-            try:
-                with open(self.context_ledger_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        data = json.loads(line.strip())
-                        if data.get("context_id") == context_id:
-                            latest = data
-                return latest
-            except: pass
+            self._refresh_ledger()
+            return self._ledger_by_context.get(context_id)
         return None
 
     def query_reflections(self, query: str, limit: int = 5) -> List[Dict]:
         """Query the persistent context ledger for high-level reflections/summaries"""
         results = []
         if self.use_local:
-            if not self.context_ledger_path.exists(): return []
-            import json
-            try:
-                with open(self.context_ledger_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        data = json.loads(line.strip())
-                        if query.lower() in data.get("summary", "").lower():
-                            results.append(data)
-                            if len(results) >= limit: break
-            except: pass
+            query_lc = query.lower()
+            for summary_lc, data in self._refresh_ledger():
+                if query_lc in summary_lc:
+                    results.append(data)
+                    if len(results) >= limit: break
         return results
 
     def get_recent_episodes(self, limit: int = 5) -> List[Dict]:
         """Retrieve the most recent episodes for Temporal Flow (Stream F)"""
         results = []
         if self.use_local:
-            if not self.episodic_index_path.exists(): return []
-            import json
-            try:
-                # Read lines and get last N
-                with open(self.episodic_index_path, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                    recent_meta = lines[-limit:]
-                    for line in reversed(recent_meta):
-                        meta = json.loads(line.strip())
-                        episode = self._load_episode(meta["episode_id"])
-                        if episode: results.append(episode)
-            except: pass
+            # Last N index entries, newest first. While the full cache is
+            # still cold, read just the file tail instead of parsing it all.
+            if self._index_offset == 0 and limit > 0:
+                recent_meta = self._read_index_tail(limit)
+            else:
+                recent_meta = self._refresh_index()[-limit:]
+            episodes = self._load_episodes_bulk([meta["episode_id"] for meta in reversed(recent_meta)])
+            results = [episode for episode in episodes if episode]
         return results
 
     def get_episode_by_id(self, episode_id: str) -> Optional[Dict]:
@@ -902,53 +1186,334 @@ class MSP:
         """Mock implementation of child chunk retrieval (Directly searches recent text)"""
         # In a real vector DB, this would be a separate index
         # For local file mode, we fallback to searching recent episode summaries
-        recent = self.get_recent_episodes(limit=limit*3)
         matches = []
-        for ep in recent:
-            txt = f"{ep.get('turn_1', {}).get('summary', '')} {ep.get('turn_2', {}).get('summary', '')}"
-            if query.lower() in txt.lower():
+        if not self.use_local or limit <= 0:
+            return matches
+        query_lc = query.lower()
+        # Summaries are mirrored in the index, so only legacy entries need the episode file
+        if self._index_offset == 0:
+            recent_meta = self._read_index_tail(limit * 3)
+        else:
+            recent_meta = self._refresh_index()[-limit * 3:]
+        for meta in reversed(recent_meta):
+            summaries = self._load_episode_summaries(meta)
+            if summaries is None: continue
+            txt = f"{summaries[0]} {summaries[1]}"
+            if "summary_user" in meta:
+                txt_lc = f"{meta['summary_user_lc']} {meta['summary_eva_lc']}"
+            else:
+                txt_lc = txt.lower()
+            if query_lc in txt_lc:
                 matches.append({
-                    "parent_episode_id": ep.get("episode_id"),
+                    "parent_episode_id": meta["episode_id"],
                     "text": txt[:200]
                 })
                 if len(matches) >= limit: break
         return matches
 
+    def _load_episode_summaries(self, meta: Dict[str, Any]) -> Optional[tuple]:
+        """(user summary, EVA summary) for an index entry, or None if the episode is gone"""
+        episode_id = meta["episode_id"]
+        if "summary_user" in meta and "summary_eva" in meta:
+            if not (self.episodes_path / f"{episode_id}.json").exists():
+                return None
+            return meta["summary_user"], meta["summary_eva"]
+        ep = self._load_episode(episode_id)
+        if not ep:
+            return None
+        return ep.get('turn_1', {}).get('summary', ''), ep.get('turn_2', {}).get('summary', '')
+
     def query_by_pattern(self, emotion_label_sequence: List[str], limit: int = 3) -> List[Dict[str, Any]]:
         """Query episodes that FOLLOWED a specific emotional sequence (Indexed)"""
         if self.use_local:
-            if not self.episodic_index_path.exists(): return []
-            
-            index_data = []
-            import json
-            try:
-                with open(self.episodic_index_path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        index_data.append(json.loads(line.strip()))
-            except: pass
-            
+            index_data = self._refresh_index()
+
             if not index_data or len(emotion_label_sequence) < 1: return []
             
-            results = []
-            seq_len = len(emotion_label_sequence)
-            
-            for i in range(len(index_data) - seq_len):
-                hist_seq = [m.get("emotion_label") for m in index_data[i : i + seq_len]]
-                if hist_seq == emotion_label_sequence:
-                    results.append(self._load_episode(index_data[i + seq_len]["episode_id"]))
-                    if len(results) >= limit: break
+            matched = []
+            pattern = list(emotion_label_sequence)
+            seq_len = len(pattern)
+            first = pattern[0]
+            labels = self._emotion_label_seq
+
+            # Single pass over the label column; slice-compare only on a first-label hit
+            for i in range(len(labels) - seq_len):
+                if labels[i] == first and labels[i : i + seq_len] == pattern:
+                    matched.append(index_data[i + seq_len]["episode_id"])
+                    if len(matched) >= limit: break
             
-            return results
+            return self._load_episodes_bulk(matched)
         return []
 
+    def _writer(self, path: Path) -> BinaryIO:
+        """Return the persistent buffered append handle for a JSONL log"""
+        f = self._writers.get(path)
+        if f is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(path, "ab", buffering=1 << 16)
+            self._writers[path] = f
+        return f
+
+    def _append(self, path: Path, data: bytes):
+        """Append to a JSONL log, flushing the buffered handles once per _WRITER_FLUSH_INTERVAL"""
+        self._writer(path).write(data)
+        if time.monotonic() - self._writers_flushed_at >= _WRITER_FLUSH_INTERVAL:
+            self._flush_log_writers()
+
+    def flush_writers(self):
+        """Flush all buffered JSONL appends (and pending dashboard streams) to disk"""
+        if self._dashboard_dirty:
+            self.flush_dashboard_metrics()
+        self._flush_log_writers()
+
+    def _flush_log_writers(self):
+        """Flush the buffered JSONL append handles"""
+        for f in self._writers.values():
+            try:
+                f.flush()
+            except (OSError, ValueError) as e:
+                print(f"[MSP] Error flushing log writer: {e}")
+        self._writers_flushed_at = time.monotonic()
+
+    def _flush_writer(self, path: Path):
+        """Flush pending appends for one log before it is read back"""
+        f = self._writers.get(path)
+        if f is not None:
+            f.flush()
+
+    def _refresh_index(self) -> List[Dict[str, Any]]:
+        """
+        Sync the in-memory index with episodic_index.jsonl and return it.
+        Only bytes appended since the last refresh are parsed; the cache is
+        rebuilt from scratch if the file shrank or disappeared.
+        """
+        # Make buffered appends visible before looking at the file
+        self._flush_writer(self.episodic_index_path)
+
+        try:
+            size = self.episodic_index_path.stat().st_size
+        except OSError:
+            size = 0
+
+        if size < self._index_offset:
+            self._index_cache = []
+            self._index_offset = 0
+            self._by_emotion_label.clear()
+            self._by_event_label.clear()
+            self._by_episode_tag.clear()
+            self._by_tag.clear()
+            self._emotion_label_seq = []
+            self._resonance_col = array("d")
+            self._salience_anchor_col = []
+        if size == self._index_offset:
+            return self._index_cache
+
+        with open(self.episodic_index_path, "rb") as f:
+            f.seek(self._index_offset)
+            tail = f.read(size - self._index_offset)
+
+        # Leave a partially written last line for the next refresh
+        end = tail.rfind(b"\n") + 1
+        for line in tail[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                meta = loads(line)
+            except ValueError as e:
+                logger.debug("Skipped unreadable index line: %s", e)
+                continue
+            if not isinstance(meta, dict) or "episode_id" not in meta:
+                logger.debug("Skipped index line without episode_id")
+                continue
+            # Entries written before (some of) the *_lc fields existed
+            if "summary_eva_lc" not in meta:
+                _add_lc_fields(meta)
+            self._append_index_entry(meta)
+        self._index_offset += end
+        return self._index_cache
+
+    def _read_index_tail(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Parse only the last `limit` index entries, reading backwards from EOF
+        in doubling blocks (64 KiB first) until enough complete lines are seen.
+        """
+        self._flush_writer(self.episodic_index_path)
+        try:
+            f = open(self.episodic_index_path, "rb")
+        except OSError:
+            return []
+
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            block = 1 << 16
+            while True:
+                start = max(0, size - block)
+                f.seek(start)
+                data = f.read(size - start)
+                lines = data.split(b"\n")
+                # Drop the unterminated tail (in-flight write) and, unless at
+                # the start of the file, the possibly truncated first line
+                lines.pop()
+                if start > 0 and lines:
+                    lines.pop(0)
+                lines = [line for line in lines if line.strip()]
+                if len(lines) >= limit or start == 0:
+                    break
+                block *= 2
+
+        entries = []
+        for line in lines[-limit:]:
+            try:
+                meta = loads(line)
+            except ValueError as e:
+                logger.debug("Skipped unreadable index line: %s", e)
+                continue
+            if not isinstance(meta, dict) or "episode_id" not in meta:
+                logger.debug("Skipped index line without episode_id")
+                continue
+            if "summary_eva_lc" not in meta:
+                _add_lc_fields(meta)
+            entries.append(meta)
+        return entries
+
+    def _refresh_ledger(self) -> List[tuple]:
+        """
+        Sync the in-memory context ledger with context_ledger.jsonl (tail reads,
+        same scheme as _refresh_index) and return [(summary_lc, entry), ...].
+        """
+        self._flush_writer(self.context_ledger_path)
+        try:
+            size = self.context_ledger_path.stat().st_size
+        except OSError:
+            size = 0
+
+        if size < self._ledger_offset:
+            self._ledger_cache = []
+            self._ledger_by_context.clear()
+            self._ledger_offset = 0
+        if size == self._ledger_offset:
+            return self._ledger_cache
+
+        with open(self.context_ledger_path, "rb") as f:
+            f.seek(self._ledger_offset)
+            tail = f.read(size - self._ledger_offset)
+
+        end = tail.rfind(b"\n") + 1
+        for line in tail[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                data = loads(line)
+            except ValueError as e:
+                logger.debug("Skipped unreadable context ledger line: %s", e)
+                continue
+            if not isinstance(data, dict):
+                continue
+            self._ledger_cache.append(((data.get("summary") or "").lower(), data))
+            context_id = data.get("context_id")
+            if context_id is not None:
+                self._ledger_by_context[context_id] = data
+        self._ledger_offset += end
+        return self._ledger_cache
+
+    def _append_index_entry(self, meta: Dict[str, Any]):
+        """Add one index entry to the cache and its secondary indexes"""
+        pos = len(self._index_cache)
+        self._index_cache.append(meta)
+        self._emotion_label_seq.append(meta.get("emotion_label"))
+        ri = meta.get("resonance_index", 0.0)
+        self._resonance_col.append(ri if isinstance(ri, (int, float)) else 0.0)
+        self._salience_anchor_col.append(meta["salience_anchor_lc"])
+        self._by_emotion_label.setdefault(meta["emotion_label_lc"], []).append(pos)
+        self._by_event_label.setdefault(meta["event_label_lc"], []).append(pos)
+        self._by_episode_tag.setdefault(meta["episode_tag_lc"], []).append(pos)
+        for tag in set(meta["tags_lc"]):
+            self._by_tag.setdefault(tag, []).append(pos)
+
+    @staticmethod
+    def _positions_matching(by_key: Dict[str, List[int]], needle: str) -> List[int]:
+        """Positions whose key contains needle (scans distinct keys, not episodes)"""
+        hits = [positions for key, positions in by_key.items() if needle in key]
+        if len(hits) == 1:
+            return hits[0]
+        return sorted(pos for positions in hits for pos in positions)
+
     def _load_episode(self, episode_id: str) -> Dict[str, Any]:
-        """Load full episode content from disk"""
-        import json
+        """
+        Load full episode content from disk.
+        Raw file bytes are kept in a bounded LRU and revalidated against the
+        file mtime, so repeat hits cost one stat() and an orjson parse instead
+        of a read. Each call returns a freshly parsed dict the caller may mutate.
+        """
         file_path = self.episodes_path / f"{episode_id}.json"
-        if file_path.exists():
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            self._episode_cache.pop(episode_id, None)
+            return {}
+
+        cached = self._episode_cache.get(episode_id)
+        if cached is not None and cached[0] == mtime:
+            self._episode_cache.move_to_end(episode_id)
+            return loads(cached[1])
+
+        loaded = self._read_episode_file(file_path)
+        if loaded is None: return {}
+        raw, data = loaded
+        self._cache_episode(episode_id, mtime, raw)
+        return data
+
+    def _load_episodes_bulk(self, episode_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        _load_episode for many IDs, in order. Cache hits are served inline;
+        when more than a handful of files must be read, the reads run on a
+        thread pool (the cache itself is only touched from this thread).
+        """
+        if len(episode_ids) <= _BULK_LOAD_MIN:
+            return [self._load_episode(episode_id) for episode_id in episode_ids]
+
+        results: List[Dict[str, Any]] = [{} for _ in episode_ids]
+        misses = []
+        for i, episode_id in enumerate(episode_ids):
+            file_path = self.episodes_path / f"{episode_id}.json"
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except: pass
-        return {}
+                mtime = os.stat(file_path).st_mtime_ns
+            except OSError:
+                self._episode_cache.pop(episode_id, None)
+                continue
+            cached = self._episode_cache.get(episode_id)
+            if cached is not None and cached[0] == mtime:
+                self._episode_cache.move_to_end(episode_id)
+                results[i] = loads(cached[1])
+            else:
+                misses.append((i, episode_id, file_path, mtime))
+
+        if len(misses) > _BULK_LOAD_MIN:
+            with ThreadPoolExecutor(max_workers=min(8, len(misses))) as pool:
+                loaded = list(pool.map(self._read_episode_file, [m[2] for m in misses]))
+        else:
+            loaded = [self._read_episode_file(m[2]) for m in misses]
+
+        for (i, episode_id, _, mtime), item in zip(misses, loaded):
+            if item is None: continue
+            raw, data = item
+            self._cache_episode(episode_id, mtime, raw)
+            results[i] = data
+        return results
+
+    @staticmethod
+    def _read_episode_file(file_path: Path) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """Read and parse one episode file; (raw bytes, parsed dict) or None"""
+        try:
+            with open(file_path, "rb") as f:
+                raw = f.read()
+            return raw, loads(raw)
+        except (OSError, ValueError) as e:
+            logger.debug("Skipped unreadable episode file %s: %s", file_path, e)
+            return None
+
+    def _cache_episode(self, episode_id: str, mtime: int, raw: bytes):
+        self._episode_cache[episode_id] = (mtime, raw)
+        if len(self._episode_cache) > _EPISODE_CACHE_SIZE:
+            self._episode_cache.popitem(last=False)
 
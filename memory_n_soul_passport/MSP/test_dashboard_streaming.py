@@ -7,24 +7,14 @@ import sys
 import time
 import random
 import json
+import logging
 
-# Add project root to path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add the MSP package's parent to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-# Import MSP with absolute path
-import importlib.util
-spec = importlib.util.spec_from_file_location("msp_engine", Path(__file__).parent / "msp_engine.py")
-msp_module = importlib.util.module_from_spec(spec)
+from MSP.msp_engine import MSP
 
-# Also need utils module
-utils_spec = importlib.util.spec_from_file_location("utils", Path(__file__).parent / "utils.py")
-utils_module = importlib.util.module_from_spec(utils_spec)
-spec.loader.exec_module(utils_module)
-sys.modules['msp.utils'] = utils_module
-
-spec.loader.exec_module(msp_module)
-MSP = msp_module.MSP
+logger = logging.getLogger(__name__)
 
 def test_dashboard_streaming():
     """Test dashboard metric registration with simulated 30 Hz streaming."""
@@ -44,29 +34,24 @@ def test_dashboard_streaming():
     ]
     
     # Simulate 3 seconds @ 30 Hz = 90 samples per hormone
+    # Fluctuating levels and heart rate are generated up front, one row per frame
+    hormone_levels = [[10.0 + random.uniform(-2.0, 2.0) for _ in hormones] for _ in range(90)]
+    heart_rates = [72 + random.randint(-5, 5) for _ in range(90)]
+    
+    # 30 Hz deadlines on the monotonic clock (no accumulated sleep drift)
+    next_t = time.monotonic()
     for i in range(90):
-        for hormone in hormones:
-            # Simulate fluctuating levels
-            value = 10.0 + random.uniform(-2.0, 2.0)
-            msp.register_dashboard_metric(
-                metric_name=hormone,
-                value=value,
-                category="physiological_stream"
-            )
-        
-        # Heart rate
-        hr = 72 + random.randint(-5, 5)
-        msp.register_dashboard_metric(
-            metric_name="heart_rate",
-            value=hr,
-            category="physiological_stream"
-        )
+        frame = dict(zip(hormones, hormone_levels[i]))
+        frame["heart_rate"] = heart_rates[i]
+        msp.register_dashboard_metrics_batch(frame, category="physiological_stream")
         
-        # 30 Hz = ~33ms interval
-        time.sleep(0.033)
+        next_t += 1 / 30.0
+        delay = next_t - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
         
         if (i + 1) % 30 == 0:
-            print(f"  → {i + 1}/90 samples registered...")
+            logger.debug("  → %d/90 samples registered...", i + 1)
     
     print("✓ Physiological streaming complete")
     
@@ -103,8 +88,8 @@ def test_dashboard_streaming():
     for metric_name, data in snapshot['streaming_metrics'].items():
         print(f"  → {metric_name}:")
         print(f"     Category: {data['category']}")
-        print(f"     Samples: {len(data['values'])}")
-        print(f"     Latest: {data['values'][-1] if data['values'] else 'N/A'}")
+        print(f"     Samples: {data['count']}")
+        print(f"     Latest: {data['latest'] if data['count'] else 'N/A'}")
     
     print("\n[TEST] ✅ All tests passed!")
 
@@ -1,11 +1,36 @@
 from pathlib import Path
 from datetime import datetime, timezone
 import json
+import mmap
 import os
+import time
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# load_json memory-maps files larger than this instead of reading them
+_MMAP_MIN_SIZE = 64 * 1024
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last now_iso() call
+_NOW_CACHE = (None, "")
 
 def now_iso() -> str:
     """Return current UTC timestamp in ISO format"""
-    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    global _NOW_CACHE
+    t = time.time()
+    sec = int(t)
+    cached_sec, prefix = _NOW_CACHE
+    if sec != cached_sec:
+        # Date/time part only changes once per second
+        prefix = datetime.fromtimestamp(sec, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+        _NOW_CACHE = (sec, prefix)
+    usec = int((t - sec) * 1_000_000)
+    if usec:
+        return f"{prefix}.{usec:06d}Z"
+    return prefix + "Z"
 
 def ensure_dir(p: Path):
     """Ensure directory exists"""
@@ -14,24 +39,54 @@ def ensure_dir(p: Path):
 
 def load_json(path: Path) -> dict:
     """Load JSON file, return empty dict if not exists or error"""
-    if not path.exists():
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
         return {}
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(path, 'rb') as f:
+            if size > _MMAP_MIN_SIZE:
+                # Parse straight from the page cache instead of copying the file into a buffer
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if not ORJSON_AVAILABLE:
+                        return json.loads(mm[:])
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+            return loads(f.read())
     except Exception as e:
         print(f"[MSP-Utils] Load JSON error {path}: {e}")
         return {}
 
 def save_json(path: Path, data: dict):
     """Save JSON file atomically"""
-    ensure_dir(path.parent)
-    tmp_path = path.with_suffix('.tmp')
+    path_str = str(path)
+    tmp_path = path_str + '.tmp'
     try:
-        with open(tmp_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        tmp_path.replace(path)
+        if ORJSON_AVAILABLE:
+            buf = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            buf = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        try:
+            f = open(tmp_path, 'wb')
+        except FileNotFoundError:
+            ensure_dir(path.parent)
+            f = open(tmp_path, 'wb')
+        with f:
+            f.write(buf)
+        os.replace(tmp_path, path_str)
     except Exception as e:
         print(f"[MSP-Utils] Save JSON error {path}: {e}")
-        if tmp_path.exists():
+        if os.path.exists(tmp_path):
             os.remove(tmp_path)
+
+def dumps_line(data: dict) -> bytes:
+    """Serialize one JSONL record as UTF-8 bytes with trailing newline"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+def loads(data):
+    """Parse JSON from bytes or str (raises ValueError on bad input)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -116,6 +116,8 @@ class MSPClient:
         # In-memory cache
         self.cache_size = cache_size
         self._episode_cache: List[Dict] = []
+        # Lowercase tag set per cached episode (kept in step with _episode_cache)
+        self._episode_tag_sets: List[frozenset] = []
         self._cache_loaded = False
 
         # Semantic concepts
@@ -151,9 +153,19 @@ class MSPClient:
 
         episodes = self._read_all_episodes_from_log()
         self._episode_cache = episodes[-self.cache_size:]
+        self._episode_tag_sets = [self._episode_tag_set(ep) for ep in self._episode_cache]
         self._cache_loaded = True
         print(f"[MSP] Loaded {len(self._episode_cache)} episodes into cache")
 
+    @staticmethod
+    def _episode_tag_set(ep: Dict) -> frozenset:
+        """Lowercase tags of an episode (Schema V2: turn_1.semantic_frames, Legacy: root tags)"""
+        if "turn_1" in ep:
+            tags = ep.get("turn_1", {}).get("semantic_frames", [])
+        else:
+            tags = ep.get("tags", [])
+        return frozenset(t.lower() for t in tags)
+
     def _read_all_episodes_from_log(self) -> List[Dict]:
         """Read all episodes from JSONL log file"""
         if not self.episodic_log.exists():
@@ -211,17 +223,10 @@ class MSPClient:
 
         # Search in cache first (fast)
         matches = []
-        tags_lower = [t.lower() for t in tags]
-
-        for ep in self._episode_cache:
-            # Schema V2: tags are in turn_1.semantic_frames
-            # Legacy: tags are at root level
-            if "turn_1" in ep:
-                ep_tags = [t.lower() for t in ep.get("turn_1", {}).get("semantic_frames", [])]
-            else:
-                ep_tags = [t.lower() for t in ep.get("tags", [])]
+        tags_lower = frozenset(t.lower() for t in tags)
 
-            if any(tag in ep_tags for tag in tags_lower):
+        for ep, ep_tags in zip(self._episode_cache, self._episode_tag_sets):
+            if not tags_lower.isdisjoint(ep_tags):
                 # Schema V2: RI in state_snapshot.Resonance_index
                 # Legacy: resonance_index at root
                 if "state_snapshot" in ep:
@@ -240,9 +245,9 @@ class MSPClient:
                     continue
 
                 # Schema V2: tags in turn_1.semantic_frames
-                ep_tags = [t.lower() for t in ep.get("turn_1", {}).get("semantic_frames", [])]
+                ep_tags = ep.get("turn_1", {}).get("semantic_frames", [])
 
-                if any(tag in ep_tags for tag in tags_lower):
+                if any(t.lower() in tags_lower for t in ep_tags):
                     # Schema V2: RI in state_snapshot.Resonance_index
                     ri = ep.get("state_snapshot", {}).get("Resonance_index", 0)
 
@@ -498,8 +503,10 @@ class MSPClient:
 
         # 4. Update cache (use full episode for backward compat)
         self._episode_cache.append(full_episode)
+        self._episode_tag_sets.append(self._episode_tag_set(full_episode))
         if len(self._episode_cache) > self.cache_size:
             self._episode_cache.pop(0)
+            self._episode_tag_sets.pop(0)
 
         # 5. Update memory_index.json (lightweight search index)
         self._update_memory_index(full_episode)
@@ -1336,6 +1343,7 @@ class MSPClient:
     def clear_cache(self):
         """Clear in-memory cache"""
         self._episode_cache = []
+        self._episode_tag_sets = []
         self._cache_loaded = False
         print("[MSP] Cache cleared")
 
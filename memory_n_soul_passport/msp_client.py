@@ -29,7 +29,7 @@ import json
 import hashlib
 import yaml
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from pathlib import Path
 import math
 import re
@@ -120,8 +120,13 @@ class MSPClient:
         # In-memory cache
         self.cache_size = cache_size
         self._episode_cache: List[Dict] = []
+        # Lowercase tag set per cached episode (kept in step with _episode_cache)
+        self._episode_tag_sets: List[frozenset] = []
         self._cache_loaded = False
 
+        # Called with no arguments after every episode write (e.g. to drop read caches)
+        self._write_listeners: List[Callable[[], None]] = []
+
         # Semantic concepts
         self._semantic_concepts: Dict = {}
         self._load_semantic_concepts()
@@ -160,9 +165,19 @@ class MSPClient:
 
         episodes = self._read_all_episodes_from_log()
         self._episode_cache = episodes[-self.cache_size:]
+        self._episode_tag_sets = [self._episode_tag_set(ep) for ep in self._episode_cache]
         self._cache_loaded = True
         print(f"[MSP] Loaded {len(self._episode_cache)} episodes into cache")
 
+    @staticmethod
+    def _episode_tag_set(ep: Dict) -> frozenset:
+        """Lowercase tags of an episode (Schema V2: turn_1.semantic_frames, Legacy: root tags)"""
+        if "turn_1" in ep:
+            tags = ep.get("turn_1", {}).get("semantic_frames", [])
+        else:
+            tags = ep.get("tags", [])
+        return frozenset(t.lower() for t in tags)
+
     def _read_all_episodes_from_log(self) -> List[Dict]:
         """Read all episodes from JSONL log file"""
         if not self.episodic_log.exists():
@@ -219,17 +234,10 @@ class MSPClient:
 
         # Search in cache first (fast)
         matches = []
-        tags_lower = [t.lower() for t in tags]
+        tags_lower = frozenset(t.lower() for t in tags)
 
-        for ep in self._episode_cache:
-            # Schema V2: tags are in turn_1.semantic_frames
-            # Legacy: tags are at root level
-            if "turn_1" in ep:
-                ep_tags = [t.lower() for t in ep.get("turn_1", {}).get("semantic_frames", [])]
-            else:
-                ep_tags = [t.lower() for t in ep.get("tags", [])]
-
-            if any(tag in ep_tags for tag in tags_lower):
+        for ep, ep_tags in zip(self._episode_cache, self._episode_tag_sets):
+            if not tags_lower.isdisjoint(ep_tags):
                 # Schema V2: RI in state_snapshot.Resonance_index
                 # Legacy: resonance_index at root
                 if "state_snapshot" in ep:
@@ -248,9 +256,9 @@ class MSPClient:
                     continue
 
                 # Schema V2: tags in turn_1.semantic_frames
-                ep_tags = [t.lower() for t in ep.get("turn_1", {}).get("semantic_frames", [])]
+                ep_tags = ep.get("turn_1", {}).get("semantic_frames", [])
 
-                if any(tag in ep_tags for tag in tags_lower):
+                if any(t.lower() in tags_lower for t in ep_tags):
                     # Schema V2: RI in state_snapshot.Resonance_index
                     ri = ep.get("state_snapshot", {}).get("Resonance_index", 0)
 
@@ -504,8 +512,10 @@ class MSPClient:
 
         # 4. Update cache (use full episode for backward compat)
         self._episode_cache.append(full_episode)
+        self._episode_tag_sets.append(self._episode_tag_set(full_episode))
         if len(self._episode_cache) > self.cache_size:
             self._episode_cache.pop(0)
+            self._episode_tag_sets.pop(0)
 
         # 5. Update memory_index.json (lightweight search index)
         self._update_memory_index(full_episode)
@@ -519,6 +529,8 @@ class MSPClient:
             # Legacy format
             self.write_sensory_log(episode_id, episode_data["qualia"])
 
+        self._notify_write_listeners()
+
         # 7. Increment compression counters (AFTER writing episode)
         new_counters = self._increment_compression_counters()
         print(f"[MSP] ✓ Written episode: {episode_id} (User: {len(json.dumps(user_episode))}B, LLM: {len(json.dumps(llm_episode))}B)")
@@ -526,6 +538,20 @@ class MSPClient:
 
         return episode_id
 
+    def add_write_listener(self, callback: Callable[[], None]):
+        """
+        Register a callback to run after each episode write.
+        Used by readers that cache query results (e.g. AgenticRAG).
+        """
+        self._write_listeners.append(callback)
+
+    def _notify_write_listeners(self):
+        for callback in self._write_listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[MSP] Write listener failed: {e}")
+
     def get_full_episode(self, episode_id: str) -> Optional[Dict]:
         """
         Get full episode by merging user + llm files
@@ -1369,6 +1395,7 @@ class MSPClient:
     def clear_cache(self):
         """Clear in-memory cache"""
         self._episode_cache = []
+        self._episode_tag_sets = []
         self._cache_loaded = False
         print("[MSP] Cache cleared")
 
@@ -1378,6 +1405,7 @@ class MSPClient:
         self._load_semantic_concepts()
         self._load_turn_cache()
         self._load_cache()
+        self._notify_write_listeners()
         print("[MSP] Reloaded from disk")
 
 
@@ -1405,6 +1433,45 @@ class MSPClient:
         """Alias for Sensory Stream"""
         return self.query_by_qualia(min_intensity=0.5, max_results=limit)
 
+    # Stream name -> query method, for query_multi_stream
+    _STREAM_QUERIES = {
+        "narrative": "query_narrative_chain",
+        "salience": "query_by_salience",
+        "sensory": "query_sensory_memories",
+        "intuition": "query_semantic_patterns",
+        "emotion": "query_by_physio_state",
+        "temporal": "query_recent_episodes",
+        "reflection": "query_reflections",
+    }
+
+    def query_multi_stream(self, streams: List[Dict[str, Any]]) -> Dict[str, List[Dict]]:
+        """
+        Run several stream queries in one call (Agentic RAG batch API)
+
+        Args:
+            streams: One request per stream, e.g.
+                     [{"stream": "narrative", "tags": [...], "limit": 3},
+                      {"stream": "salience", "min_ri": 0.7, "limit": 3}, ...]
+                     Keys other than "stream" are passed to that stream's query method.
+
+        Returns:
+            {stream_name: [episode, ...]}; a stream that is unknown or fails is omitted
+        """
+        self._load_cache()
+        results = {}
+        for request in streams:
+            params = dict(request)
+            stream = params.pop("stream", None)
+            method = self._STREAM_QUERIES.get(stream)
+            if method is None:
+                print(f"[MSP] Warning: Unknown stream in multi-stream query: {stream}")
+                continue
+            try:
+                results[stream] = getattr(self, method)(**params)
+            except Exception as e:
+                print(f"[MSP] Warning: {stream} stream query failed: {e}")
+        return results
+
 
     def register_dashboard_metric(
         self,
@@ -1438,19 +1505,28 @@ class MSPClient:
             slot: State slot identifier (e.g., 'physio_state', 'matrix_state')
             data: State data (dict or value)
         """
+        self.set_active_states({slot: data})
+
+    def set_active_states(self, updates: Dict[str, Any]):
+        """
+        Set several State Bus slots in one call (one timestamp, one cache update).
+
+        Args:
+            updates: {slot: data} pairs, same semantics as set_active_state
+        """
         # 1. Update In-memory cache
-        self._active_state_cache[slot] = {
-            "data": data,
-            "timestamp": datetime.now().isoformat()
-        }
+        timestamp = datetime.now().isoformat()
+        entries = {slot: {"data": data, "timestamp": timestamp} for slot, data in updates.items()}
+        self._active_state_cache.update(entries)
 
-        # 2. Persist to transient file (for crash recovery)
-        try:
-            state_file = self.active_state_dir / f"{slot}.json"
-            with open(state_file, 'w', encoding='utf-8') as f:
-                json.dump(self._active_state_cache[slot], f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"[MSP] Error persisting active state {slot}: {e}")
+        # 2. Persist to transient files (for crash recovery)
+        for slot, entry in entries.items():
+            try:
+                state_file = self.active_state_dir / f"{slot}.json"
+                with open(state_file, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                print(f"[MSP] Error persisting active state {slot}: {e}")
 
     def get_active_state(self, slot: str) -> Optional[Any]:
         """
@@ -1480,6 +1556,22 @@ class MSPClient:
         
         return None
 
+    def get_active_states(self, slots) -> tuple:
+        """
+        Get several State Bus slots at once.
+
+        Args:
+            slots: Iterable of slot identifiers
+
+        Returns:
+            Tuple of state data (None for missing slots), in the order of `slots`
+        """
+        cache = self._active_state_cache
+        return tuple(
+            cache[slot]["data"] if slot in cache else self.get_active_state(slot)
+            for slot in slots
+        )
+
     def get_all_active_states(self) -> Dict[str, Any]:
         """
         Get all current active states.
@@ -0,0 +1,198 @@
+"""
+Test EpisodicMemory emotion index and query cache
+Near-duplicate cache hits, invalidation on writes, and the top-k cosine kernel
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "memory_n_soul_passport"))
+
+from MSP.episodic import EpisodicMemory, EMOTION_AXES, NUMPY_AVAILABLE
+from MSP.msp_engine import MSP
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+    from MSP._kernels import topk_cosine
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+
+    def find(self, query, projection=None):
+        return [self.docs[i] for i in query["episode_id"]["$in"] if i in self.docs]
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+
+class FakeMongo:
+    """Counts the remote scans EpisodicMemory falls back to"""
+    def __init__(self):
+        self.db = type("DB", (), {})()
+        self.db.episodes = FakeCollection()
+        self.emotion_calls = 0
+        self.tag_calls = 0
+
+    def query_episodes_by_emotion_state(self, emotion_vec, limit):
+        self.emotion_calls += 1
+        return [{"episode_id": f"remote_{self.emotion_calls}"}]
+
+    def query_episodes_by_tags(self, tags, limit):
+        self.tag_calls += 1
+        return [{"episode_id": "tagged"}]
+
+    def insert_episode(self, episode_data, embedding):
+        return True
+
+
+class FakeSensory:
+    def write_texture(self, episode_id, texture_data):
+        return f"sens_{episode_id}"
+
+
+class FakeMSP:
+    def __init__(self):
+        self.mongo_bridge = FakeMongo()
+        self.neo4j_bridge = None
+        self.sensory = FakeSensory()
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy not installed")
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.msp = FakeMSP()
+        self.episodic = EpisodicMemory(self.msp)
+
+    def test_near_duplicate_query_hits_cache(self):
+        first = self.episodic.query_by_emotion({"stress": 0.5, "joy": 0.5}, 0.5, 3)
+        second = self.episodic.query_by_emotion({"stress": 0.501, "joy": 0.5}, 0.5, 3)
+        self.assertEqual(first, second)
+        self.assertEqual(self.msp.mongo_bridge.emotion_calls, 1)
+
+    def test_dissimilar_query_misses_cache(self):
+        self.episodic.query_by_emotion({"stress": 0.9, "joy": 0.1}, 0.5, 3)
+        self.episodic.query_by_emotion({"stress": 0.1, "joy": 0.9}, 0.5, 3)
+        self.assertEqual(self.msp.mongo_bridge.emotion_calls, 2)
+
+    def test_different_limit_misses_cache(self):
+        self.episodic.query_by_emotion({"stress": 0.5}, 0.5, 3)
+        self.episodic.query_by_emotion({"stress": 0.5}, 0.5, 4)
+        self.assertEqual(self.msp.mongo_bridge.emotion_calls, 2)
+
+    def test_tag_order_shares_cache_entry(self):
+        self.episodic.query_by_tags(["b", "a"])
+        self.episodic.query_by_tags(["a", "b"])
+        self.assertEqual(self.msp.mongo_bridge.tag_calls, 1)
+
+    def test_write_texture_invalidates_cache(self):
+        query = {"stress": 0.5, "joy": 0.5}
+        self.episodic.query_by_emotion(query, 0.5, 3)
+        self.episodic.write_texture("ep1", {"warmth": 1.0})
+        self.episodic.query_by_emotion(query, 0.5, 3)
+        self.assertEqual(self.msp.mongo_bridge.emotion_calls, 2)
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy not installed")
+class TestEngineWriteInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.msp = MSP(self.tmp, use_local=True)
+        # Route writes through the remote (bridge) path
+        self.msp.use_local = False
+        self.msp.mongo_bridge = FakeMongo()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_write_episode_invalidates_cache(self):
+        query = {"stress": 0.5, "joy": 0.5}
+        self.msp.query_by_emotion(query, 0.5, 3)
+        self.msp.query_by_emotion(query, 0.5, 3)
+        self.assertEqual(self.msp.mongo_bridge.emotion_calls, 1)
+
+        self.msp.write_episode({"turn_1": {"summary": "hi"}})
+        self.msp.query_by_emotion(query, 0.5, 3)
+        self.assertEqual(self.msp.mongo_bridge.emotion_calls, 2)
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy not installed")
+class TestEmotionIndex(unittest.TestCase):
+    def setUp(self):
+        self.msp = FakeMSP()
+        self.episodic = EpisodicMemory(self.msp)
+        rng = np.random.default_rng(7)
+        self.textures = {}
+        for k in range(40):
+            texture = dict(zip(EMOTION_AXES, rng.random(len(EMOTION_AXES)).tolist()))
+            self.textures[f"ep{k}"] = texture
+            self.episodic.write_texture(f"ep{k}", texture)
+            self.msp.mongo_bridge.db.episodes.docs[f"ep{k}"] = {"episode_id": f"ep{k}"}
+
+    @staticmethod
+    def _cosine(a, b):
+        x = np.array([a.get(axis, 0.0) for axis in EMOTION_AXES])
+        y = np.array([b.get(axis, 0.0) for axis in EMOTION_AXES])
+        return float(x @ y / np.linalg.norm(x) / np.linalg.norm(y))
+
+    def test_index_ranks_by_cosine(self):
+        query = {"stress": 0.9, "joy": 0.2, "openness": 0.4}
+        expected = sorted(self.textures, key=lambda k: -self._cosine(self.textures[k], query))[:5]
+        found = [ep["episode_id"] for ep in self.episodic.query_by_emotion(query, 0.0, 5)]
+        self.assertEqual(found, expected)
+        self.assertEqual(self.msp.mongo_bridge.emotion_calls, 0)
+
+    def test_rewritten_texture_replaces_row(self):
+        self.episodic.write_texture("ep0", {"drive": 1.0})
+        found = self.episodic.query_by_emotion({"drive": 1.0}, 0.999, 5)
+        self.assertEqual([ep["episode_id"] for ep in found], ["ep0"])
+        self.assertEqual(len(self.episodic._emo_ids), 40)
+
+    def test_no_index_match_falls_back_to_remote(self):
+        found = self.episodic.query_by_emotion({"stress": 1.0}, 1.01, 5)
+        self.assertEqual(found, [{"episode_id": "remote_1"}])
+
+    def test_partial_index_defers_to_remote(self):
+        # An episode stored by another process (or before a restart) has no row
+        self.msp.mongo_bridge.db.episodes.docs["older"] = {"episode_id": "older"}
+        found = self.episodic.query_by_emotion({"stress": 0.9, "joy": 0.2}, 0.0, 5)
+        self.assertEqual(found, [{"episode_id": "remote_1"}])
+        self.assertEqual(self.msp.mongo_bridge.emotion_calls, 1)
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "NumPy not installed")
+class TestTopkCosine(unittest.TestCase):
+    def setUp(self):
+        mat = np.array([[1, 0], [0.6, 0.8], [0, 1], [0.8, 0.6]], np.float32)
+        self.mat = mat / np.linalg.norm(mat, axis=1, keepdims=True)
+        self.q = np.array([1, 0], np.float32)
+
+    def test_orders_best_first(self):
+        idx, scores = topk_cosine(self.mat, self.q, -1.0, 4)
+        self.assertEqual(idx.tolist(), [0, 3, 1, 2])
+        self.assertTrue(np.all(np.diff(scores) <= 0))
+        self.assertEqual(idx.dtype, np.int64)
+        self.assertEqual(scores.dtype, np.float32)
+
+    def test_threshold_filters(self):
+        idx, scores = topk_cosine(self.mat, self.q, 0.7, 4)
+        self.assertEqual(idx.tolist(), [0, 3])
+        self.assertTrue(np.all(scores >= 0.7))
+
+    def test_k_limits_results(self):
+        idx, _ = topk_cosine(self.mat, self.q, -1.0, 2)
+        self.assertEqual(idx.tolist(), [0, 3])
+
+    def test_empty_inputs(self):
+        idx, scores = topk_cosine(self.mat[:0], self.q, 0.0, 3)
+        self.assertEqual(len(idx), 0)
+        idx, scores = topk_cosine(self.mat, self.q, 0.0, 0)
+        self.assertEqual(len(scores), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
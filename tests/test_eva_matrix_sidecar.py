@@ -0,0 +1,117 @@
+"""
+Test EVA Matrix binary state sidecar
+eva_matrix_state.bin round-trip, JSON-newer-wins on load, and the restricted unpickler
+"""
+
+import os
+import sys
+import time
+import pickle
+import shutil
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "eva_matrix"))
+
+import eva_matrix_engine
+from eva_matrix_engine import EVAMatrixSystem
+
+STATE = {
+    "axes_9d": {"joy": 0.8, "stress": 0.25, "legacy_note": "kept"},
+    "momentum": {"intensity": 0.4, "velocity": 0.1},
+    "emotion_label": "Joy",
+}
+
+
+class Exploit:
+    def __reduce__(self):
+        return (os.system, ("echo sidecar-exploit",))
+
+
+class TestBinarySidecar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        logging.disable(logging.WARNING)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _save(self, state=STATE, binary_sidecar=True) -> EVAMatrixSystem:
+        system = EVAMatrixSystem(base_path=self.tmp, binary_sidecar=binary_sidecar)
+        system.load_state(state)
+        system._dirty = True
+        system.flush()
+        return system
+
+    def _load(self) -> EVAMatrixSystem:
+        return EVAMatrixSystem(base_path=self.tmp, binary_sidecar=True)
+
+    @staticmethod
+    def _touch_later(path: Path, seconds: int):
+        stamp = time.time_ns() + seconds * 10**9
+        os.utime(path, ns=(stamp, stamp))
+
+    def test_round_trip_uses_sidecar(self):
+        saved = self._save()
+        self.assertTrue(saved.state_bin_file.exists())
+
+        read_json = eva_matrix_engine._read_state_file
+        eva_matrix_engine._read_state_file = lambda path: self.fail("JSON state was read")
+        try:
+            loaded = self._load()
+        finally:
+            eva_matrix_engine._read_state_file = read_json
+
+        self.assertEqual(loaded.axes_9d, STATE["axes_9d"])
+        self.assertEqual(loaded.momentum, STATE["momentum"])
+        self.assertEqual(loaded.emotion_label, "Joy")
+        self.assertEqual(loaded.axes_9d_arr[EVAMatrixSystem.AXIS_NAMES.index("joy")], 0.8)
+
+    def test_in_place_axes_edit_is_persisted(self):
+        saved = self._save()
+        saved.axes_9d["clarity"] = 0.6
+        saved._dirty = True
+        saved.flush()
+
+        loaded = self._load()
+        self.assertEqual(loaded.axes_9d["clarity"], 0.6)
+        self.assertEqual(loaded.axes_9d["legacy_note"], "kept")
+
+    def test_newer_json_wins(self):
+        saved = self._save()
+        other = dict(STATE, emotion_label="Calm")
+        # A save with the sidecar off rewrites only the JSON file
+        self._save(other, binary_sidecar=False)
+        self._touch_later(saved.state_file, 2)
+
+        loaded = self._load()
+        self.assertEqual(loaded.emotion_label, "Calm")
+
+    def test_sidecar_off_by_default(self):
+        saved = EVAMatrixSystem(base_path=self.tmp)
+        saved.load_state(STATE)
+        saved._dirty = True
+        saved.flush()
+        self.assertIsNone(saved.state_bin_file)
+        self.assertEqual(os.listdir(saved.state_file.parent), ["eva_matrix_state.json"])
+
+    def test_unpickler_rejects_arbitrary_globals(self):
+        saved = self._save()
+        saved.state_bin_file.write_bytes(pickle.dumps(Exploit(), protocol=5))
+        self._touch_later(saved.state_bin_file, 2)
+
+        with open(saved.state_bin_file, "rb") as f:
+            with self.assertRaises(pickle.UnpicklingError):
+                eva_matrix_engine._SidecarUnpickler(f).load()
+
+        # Loading falls back to the JSON state
+        loaded = self._load()
+        self.assertEqual(loaded.axes_9d, STATE["axes_9d"])
+        self.assertEqual(loaded.emotion_label, "Joy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+Test MSP buffered JSONL log writers
+Appends reach disk within _WRITER_FLUSH_INTERVAL without an explicit flush
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "memory_n_soul_passport"))
+
+from MSP.msp_engine import MSP
+
+
+class TestLogWriterFlush(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.msp = MSP(self.tmp, use_local=True)
+
+    def tearDown(self):
+        self.msp.flush_writers()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _log_lines(self):
+        path = self.msp.semantic_log_path
+        return path.read_bytes().count(b"\n") if path.exists() else 0
+
+    def test_append_stays_buffered_within_interval(self):
+        self.msp.write_semantic("tea", "a drink", "ep_1")
+        self.assertEqual(self._log_lines(), 0)
+
+    def test_append_flushes_after_interval(self):
+        self.msp.write_semantic("tea", "a drink", "ep_1")
+        self.msp._writers_flushed_at -= 10
+        self.msp.write_semantic("milk", "another drink", "ep_1")
+        self.assertEqual(self._log_lines(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Test MSPClient.query_multi_stream
+Several stream queries in one call (Agentic RAG batch API)
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "memory_n_soul_passport"))
+
+from msp_client import MSPClient
+
+
+def make_episode(i: int, label: str, tags):
+    return {
+        "episode_tag": f"episode_{i}",
+        "event_label": f"event {i}",
+        "turn_1": {"summary": f"user {i}", "semantic_frames": list(tags)},
+        "turn_2": {"summary": f"eva {i}"},
+        "state_snapshot": {
+            "EVA_matrix": {"emotion_label": label},
+            "Resonance_index": 0.1 * i,
+        },
+    }
+
+
+class TestQueryMultiStream(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = Path(tempfile.mkdtemp())
+        cls.client = MSPClient(root_path=str(cls.tmp))
+        for i in range(4):
+            cls.client.write_episode(make_episode(i, "Joy", ["rain"]))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
+    def test_matches_individual_queries(self):
+        results = self.client.query_multi_stream([
+            {"stream": "intuition", "tags": ["rain"], "limit": 2},
+            {"stream": "temporal", "limit": 3},
+            {"stream": "reflection", "tags": ["rain"]},
+        ])
+        self.assertEqual(set(results), {"intuition", "temporal", "reflection"})
+        self.assertEqual(len(results["intuition"]), 2)
+        self.assertEqual(len(results["temporal"]), 3)
+        self.assertEqual(results["intuition"], self.client.query_semantic_patterns(["rain"], limit=2))
+        self.assertEqual(results["temporal"], self.client.query_recent_episodes(limit=3))
+        self.assertEqual(results["reflection"], [])
+
+    def test_unknown_and_failing_streams_are_omitted(self):
+        results = self.client.query_multi_stream([
+            {"stream": "telepathy"},
+            {"stream": "intuition"},  # missing required tags
+            {"stream": "temporal", "limit": 1},
+        ])
+        self.assertEqual(list(results), ["temporal"])
+        self.assertEqual(len(results["temporal"]), 1)
+
+    def test_request_dicts_are_not_modified(self):
+        request = {"stream": "temporal", "limit": 2}
+        self.client.query_multi_stream([request])
+        self.assertEqual(request, {"stream": "temporal", "limit": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
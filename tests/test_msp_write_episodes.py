@@ -0,0 +1,72 @@
+"""
+Test MSP.write_episodes
+Batch writes (one index append for many episodes) match single write_episode calls
+"""
+
+import sys
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "memory_n_soul_passport"))
+
+from MSP.msp_engine import MSP
+
+
+def make_episode(i: int, label: str, tags):
+    return {
+        "episode_tag": f"episode_{i}",
+        "event_label": f"event {i}",
+        "turn_1": {"summary": f"user {i}", "semantic_frames": list(tags)},
+        "turn_2": {"summary": f"eva {i}"},
+        "state_snapshot": {
+            "EVA_matrix": {"emotion_label": label},
+            "Resonance_index": 0.1 * i,
+        },
+    }
+
+
+class TestWriteEpisodes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.msp = MSP(self.tmp, use_local=True)
+
+    def tearDown(self):
+        self.msp.flush_writers()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.msp.write_episodes([]), [])
+        self.assertEqual(self.msp.episode_count, 0)
+
+    def test_batch_writes_files_and_index(self):
+        episodes = [make_episode(i, "Joy" if i % 2 else "Calm", ["rain", f"t{i}"]) for i in range(6)]
+        ids = self.msp.write_episodes(episodes)
+
+        self.assertEqual(ids, [ep["episode_id"] for ep in episodes])
+        self.assertEqual(len(set(ids)), 6)
+        self.assertEqual(self.msp.episode_count, 6)
+        for episode_id in ids:
+            self.assertTrue((self.msp.episodes_path / f"{episode_id}.json").exists())
+
+        found = self.msp.query_by_tags(["RAIN"], limit=10)
+        self.assertEqual([ep["episode_id"] for ep in found], ids)
+        joy = self.msp.query_by_emotion_label("joy", limit=10)
+        self.assertEqual([ep["episode_id"] for ep in joy], ids[1::2])
+
+    def test_batch_matches_single_writes(self):
+        single = MSP(self.tmp / "single", use_local=True)
+        for i in range(3):
+            single.write_episode(make_episode(i, "Joy", ["sun"]))
+        self.msp.write_episodes([make_episode(i, "Joy", ["sun"]) for i in range(3)])
+
+        def summaries(msp):
+            return [ep["turn_1"]["summary"] for ep in msp.query_by_tags(["sun"], limit=10)]
+
+        self.assertEqual(summaries(self.msp), summaries(single))
+        single.flush_writers()
+
+
+if __name__ == "__main__":
+    unittest.main()